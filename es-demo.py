@@ -2,11 +2,27 @@ import requests
 from bs4 import BeautifulSoup
 from elasticsearch import Elasticsearch
 from elasticsearch.exceptions import RequestError
+from elasticsearch.helpers import streaming_bulk, parallel_bulk
+import io
+import os
 import time
+import asyncio
 import random
 import json
+import argparse
+import threading
+import contextlib
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from urllib.parse import urlparse, parse_qs
 
+# Optional asyncio HTTP client; without it the async scraper runs requests in a thread pool
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
 # Initialize Elasticsearch connection
 def init_elasticsearch(host='localhost', port=9200):
     """Initialize Elasticsearch connection"""
@@ -18,18 +34,54 @@ def init_elasticsearch(host='localhost', port=9200):
         print("Failed to connect to Elasticsearch, please check configuration")
         return None
 
+# Index settings for an initial load: no periodic refreshes and no replicas to copy every document to.
+# index.translog.flush_threshold_size is left alone: Elasticsearch 9.x, which this client targets,
+# already defaults it to 10gb, so a typical bulk-load value such as 2gb would flush more often, not less
+INDEX_REPLICAS = 0
+BULK_LOAD_SETTINGS = {
+    "refresh_interval": "-1",
+    "number_of_replicas": 0
+}
+# Settings restored after loading an index created in bulk-load mode (None resets a setting to the
+# Elasticsearch default); an existing index switched to bulk-load mode gets its own values back
+NORMAL_SETTINGS = {
+    "refresh_interval": None,
+    "number_of_replicas": INDEX_REPLICAS
+}
+# Key of the index mapping's _meta holding the settings an existing index had before its bulk load
+BULK_LOAD_META_KEY = "bulk_load_restore"
+
+def _index_meta(es, index_name):
+    """_meta of an index mapping"""
+    return next(iter(es.indices.get_mapping(index=index_name).body.values()))['mappings'].get('_meta', {})
+
 # Create index and mapping
-def create_ecommerce_index(es, index_name='amazon_products'):
-    """Create Amazon product index and mapping"""
+def create_ecommerce_index(es, index_name='amazon_products', bulk_load=False):
+    """
+    Create Amazon product index and mapping
+    With bulk_load=True the index is created with BULK_LOAD_SETTINGS (an existing index is
+    switched to them after its current values are saved in the mapping's _meta, so finish_bulk_load
+    can put them back, even from another process); call finish_bulk_load when the load is done.
+    """
     if es.indices.exists(index=index_name):
         print(f"Index {index_name} already exists")
+        if bulk_load:
+            meta = _index_meta(es, index_name)
+            # Already in bulk-load mode: the saved values are the ones to restore, not the current ones
+            if BULK_LOAD_META_KEY not in meta:
+                settings = next(iter(es.indices.get_settings(index=index_name, flat_settings=True)
+                                     .body.values()))['settings']
+                meta[BULK_LOAD_META_KEY] = {key: settings.get(f"index.{key}") for key in BULK_LOAD_SETTINGS}
+                es.indices.put_mapping(index=index_name, meta=meta)
+            es.indices.put_settings(index=index_name, settings=BULK_LOAD_SETTINGS)
+            print(f"Switched index {index_name} to bulk-load settings")
         return True
         
     # Define index mapping
     mapping = {
         "settings": {
             "number_of_shards": 1,
-            "number_of_replicas": 0,
+            "number_of_replicas": INDEX_REPLICAS,
             "analysis": {
                 "analyzer": {
                     "english_analyzer": {
@@ -66,150 +118,338 @@ def create_ecommerce_index(es, index_name='amazon_products'):
         }
     }
     
+    if bulk_load:
+        mapping["settings"].update(BULK_LOAD_SETTINGS)
+    
     try:
         es.indices.create(index=index_name, body=mapping)
-        print(f"Successfully created index {index_name}")
+        print(f"Successfully created index {index_name}{' in bulk-load mode' if bulk_load else ''}")
         return True
     except RequestError as e:
         print(f"Failed to create index: {e}")
         return False
 
+# Request headers that simulate browser behavior
+REQUEST_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36",
+    "Accept-Language": "en-US,en;q=0.9",
+    "Accept-Encoding": "gzip, deflate, br",
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
+    "Connection": "keep-alive"
+}
+
 # Extract data from Amazon product page
 def scrape_amazon_product(product_url):
     """Scrape product data from Amazon product page"""
-    # Set request headers to simulate browser behavior
-    headers = {
-        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36",
-        "Accept-Language": "en-US,en;q=0.9",
-        "Accept-Encoding": "gzip, deflate, br",
-        "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
-        "Connection": "keep-alive"
-    }
-    
     try:
         # Add random delay to avoid anti-scraping measures
         time.sleep(random.uniform(2, 5))
         
         # Send request
-        response = requests.get(product_url, headers=headers, timeout=10)
+        response = requests.get(product_url, headers=REQUEST_HEADERS, timeout=10)
         response.raise_for_status()  # Raise HTTP errors
         
-        # Parse HTML
-        soup = BeautifulSoup(response.text, 'html.parser')
-        
-        # Extract ASIN (Amazon product ID)
-        parsed_url = urlparse(product_url)
-        query_params = parse_qs(parsed_url.query)
-        asin = query_params.get('asin', [None])[0]
-        
-        # If no ASIN in URL, try extracting from page
-        if not asin:
-            asin_meta = soup.find('meta', {'name': 'twitter:data1'})
-            if asin_meta:
-                asin = asin_meta.get('content', '').split(':')[-1].strip()
-        
-        # Extract product name
-        product_name = soup.find('span', {'id': 'productTitle'})
-        product_name = product_name.get_text(strip=True) if product_name else None
-        
-        # Extract price
-        price = None
-        original_price = None
-        currency = '$'
-        
-        price_elem = soup.find('span', {'class': 'a-price-whole'})
-        if price_elem:
-            price_str = price_elem.get_text(strip=True).replace(',', '').replace('.', '')
-            decimal_elem = soup.find('span', {'class': 'a-price-fraction'})
-            if decimal_elem:
-                price_str += '.' + decimal_elem.get_text(strip=True)
-            price = float(price_str) if price_str else None
-        
-        # Extract original price (if discounted)
-        original_price_elem = soup.find('span', {'class': 'a-price a-text-price'})
-        if original_price_elem:
-            original_price_str = original_price_elem.get_text(strip=True).replace(currency, '').replace(',', '')
-            original_price = float(original_price_str) if original_price_str else None
-        
-        # Extract rating and review count
-        rating = None
-        review_count = None
-        
-        rating_elem = soup.find('span', {'class': 'a-icon-alt'})
-        if rating_elem:
-            rating_str = rating_elem.get_text(strip=True).split()[0]
-            rating = float(rating_str) if rating_str else None
-        
-        review_count_elem = soup.find('span', {'id': 'acrCustomerReviewText'})
-        if review_count_elem:
-            review_count_str = review_count_elem.get_text(strip=True).split()[0].replace(',', '')
-            review_count = int(review_count_str) if review_count_str else None
-        
-        # Extract brand
-        brand = None
-        brand_elem = soup.find('a', {'id': 'bylineInfo'})
-        if brand_elem:
-            brand = brand_elem.get_text(strip=True).replace('Visit the ', '').replace(' Store', '')
-        
-        # Extract product description
-        description = None
-        description_elem = soup.find('div', {'id': 'productDescription'})
-        if description_elem:
-            description = description_elem.get_text(strip=True)
-        
-        # Extract product features
-        features = []
-        features_elems = soup.find_all('li', {'class': 'a-spacing-mini'})
-        if features_elems:
-            features = [f.get_text(strip=True) for f in features_elems[:5]]  # Get first 5 features
-        features_text = ', '.join(features)
-        
-        # Extract category information
-        category = None
-        sub_category = None
-        breadcrumbs = soup.find_all('li', {'class': 'a-spacing-none a-list-item'})
-        if len(breadcrumbs) >= 2:
-            category = breadcrumbs[-2].get_text(strip=True) if len(breadcrumbs) > 1 else None
-            sub_category = breadcrumbs[-1].get_text(strip=True) if breadcrumbs else None
-        
-        # Extract image URL
-        image_url = None
-        image_elem = soup.find('img', {'id': 'landingImage'})
-        if image_elem:
-            image_url = image_elem.get('src')
-        
-        # Extract availability status
-        availability = None
-        availability_elem = soup.find('div', {'id': 'availability'})
-        if availability_elem:
-            availability = availability_elem.get_text(strip=True)
-        
-        # Build product data dictionary
-        product_data = {
-            "product_id": asin,
-            "name": product_name,
-            "price": price,
-            "original_price": original_price,
-            "currency": currency,
-            "category": category,
-            "sub_category": sub_category,
-            "brand": brand,
-            "rating": rating,
-            "review_count": review_count,
-            "description": description,
-            "features": features_text,
-            "url": product_url,
-            "image_url": image_url,
-            "availability": availability,
-            "scraped_at": time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime())
-        }
-        
-        return product_data
+        return parse_amazon_product(response.text, product_url)
         
     except Exception as e:
         print(f"Error scraping product: {e}")
         return None
 
+# Parse Amazon product page
+def parse_amazon_product(html, product_url):
+    """
+    Extract product data from the HTML of an Amazon product page
+    Does no network access, so the async scraper can run it in worker processes.
+    """
+    soup = BeautifulSoup(html, 'html.parser')
+    
+    # Extract ASIN (Amazon product ID)
+    parsed_url = urlparse(product_url)
+    query_params = parse_qs(parsed_url.query)
+    asin = query_params.get('asin', [None])[0]
+    
+    # If no ASIN in URL, try extracting from page
+    if not asin:
+        asin_meta = soup.find('meta', {'name': 'twitter:data1'})
+        if asin_meta:
+            asin = asin_meta.get('content', '').split(':')[-1].strip()
+    
+    # Extract product name
+    product_name = soup.find('span', {'id': 'productTitle'})
+    product_name = product_name.get_text(strip=True) if product_name else None
+    
+    # Extract price
+    price = None
+    original_price = None
+    currency = '$'
+    
+    price_elem = soup.find('span', {'class': 'a-price-whole'})
+    if price_elem:
+        price_str = price_elem.get_text(strip=True).replace(',', '').replace('.', '')
+        decimal_elem = soup.find('span', {'class': 'a-price-fraction'})
+        if decimal_elem:
+            price_str += '.' + decimal_elem.get_text(strip=True)
+        price = float(price_str) if price_str else None
+    
+    # Extract original price (if discounted)
+    original_price_elem = soup.find('span', {'class': 'a-price a-text-price'})
+    if original_price_elem:
+        original_price_str = original_price_elem.get_text(strip=True).replace(currency, '').replace(',', '')
+        original_price = float(original_price_str) if original_price_str else None
+    
+    # Extract rating and review count
+    rating = None
+    review_count = None
+    
+    rating_elem = soup.find('span', {'class': 'a-icon-alt'})
+    if rating_elem:
+        rating_str = rating_elem.get_text(strip=True).split()[0]
+        rating = float(rating_str) if rating_str else None
+    
+    review_count_elem = soup.find('span', {'id': 'acrCustomerReviewText'})
+    if review_count_elem:
+        review_count_str = review_count_elem.get_text(strip=True).split()[0].replace(',', '')
+        review_count = int(review_count_str) if review_count_str else None
+    
+    # Extract brand
+    brand = None
+    brand_elem = soup.find('a', {'id': 'bylineInfo'})
+    if brand_elem:
+        brand = brand_elem.get_text(strip=True).replace('Visit the ', '').replace(' Store', '')
+    
+    # Extract product description
+    description = None
+    description_elem = soup.find('div', {'id': 'productDescription'})
+    if description_elem:
+        description = description_elem.get_text(strip=True)
+    
+    # Extract product features
+    features = []
+    features_elems = soup.find_all('li', {'class': 'a-spacing-mini'})
+    if features_elems:
+        features = [f.get_text(strip=True) for f in features_elems[:5]]  # Get first 5 features
+    features_text = ', '.join(features)
+    
+    # Extract category information
+    category = None
+    sub_category = None
+    breadcrumbs = soup.find_all('li', {'class': 'a-spacing-none a-list-item'})
+    if len(breadcrumbs) >= 2:
+        category = breadcrumbs[-2].get_text(strip=True) if len(breadcrumbs) > 1 else None
+        sub_category = breadcrumbs[-1].get_text(strip=True) if breadcrumbs else None
+    
+    # Extract image URL
+    image_url = None
+    image_elem = soup.find('img', {'id': 'landingImage'})
+    if image_elem:
+        image_url = image_elem.get('src')
+    
+    # Extract availability status
+    availability = None
+    availability_elem = soup.find('div', {'id': 'availability'})
+    if availability_elem:
+        availability = availability_elem.get_text(strip=True)
+    
+    # Build product data dictionary
+    product_data = {
+        "product_id": asin,
+        "name": product_name,
+        "price": price,
+        "original_price": original_price,
+        "currency": currency,
+        "category": category,
+        "sub_category": sub_category,
+        "brand": brand,
+        "rating": rating,
+        "review_count": review_count,
+        "description": description,
+        "features": features_text,
+        "url": product_url,
+        "image_url": image_url,
+        "availability": availability,
+        "scraped_at": time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime())
+    }
+    
+    return product_data
+
+# Per-host politeness
+class TokenBucket:
+    """
+    Token bucket allowing `rate` requests per second on average and bursts of up to `capacity`
+    Tasks waiting for a token of one host do not hold up requests to other hosts.
+    """
+    def __init__(self, rate, capacity=1):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.lock = asyncio.Lock()
+
+    async def acquire(self):
+        """Wait until a token is available and take it"""
+        async with self.lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+# Fetch one page without blocking the event loop
+async def fetch_page(session, url, timeout=10, executor=None):
+    """Fetch a page with aiohttp, or with requests in the executor's threads when aiohttp is not installed"""
+    if session is not None:
+        async with session.get(url, timeout=aiohttp.ClientTimeout(total=timeout)) as response:
+            response.raise_for_status()
+            return await response.text()
+    response = await asyncio.get_running_loop().run_in_executor(
+        executor, lambda: requests.get(url, headers=REQUEST_HEADERS, timeout=timeout))
+    response.raise_for_status()
+    return response.text
+
+# Scrape many product pages concurrently
+async def scrape_products_async(urls, concurrency=16, host_rate=0.5, host_burst=1, jitter=(0.5, 2.0),
+                                queue_size=100, workers=None, parse_workers=None, timeout=10):
+    """
+    Scrape product pages concurrently with per-host rate limiting
+    URLs go through a bounded queue to worker tasks. Each worker waits a random jitter and then for a
+    token of the URL's host, then fetches under a global limit of `concurrency` requests in flight.
+    Only that worker waits, so other hosts keep being fetched. Pages are parsed in a process pool
+    so BeautifulSoup does not stall the event loop.
+    :param urls: Iterable of product URLs (consumed lazily)
+    :param concurrency: Maximum requests in flight over all hosts
+    :param host_rate: Requests per second per host
+    :param host_burst: Requests a host may receive back to back
+    :param jitter: (min, max) seconds of random delay before each request
+    :param queue_size: URLs buffered ahead of the workers
+    :param workers: Worker tasks (default 4 * concurrency, so workers waiting on a host do not idle the rest)
+    :param parse_workers: Parser processes (default: CPU count)
+    :param timeout: Request timeout in seconds
+    :return: (products, failures): parsed product dicts and (url, error) pairs
+    """
+    loop = asyncio.get_running_loop()
+    queue = asyncio.Queue(maxsize=queue_size)
+    in_flight = asyncio.Semaphore(concurrency)
+    buckets = {}
+    products = []
+    failures = []
+    workers = workers or 4 * concurrency
+
+    async def produce():
+        for url in urls:
+            await queue.put(url)  # waits while the queue is full
+        for _ in range(workers):
+            await queue.put(None)
+
+    async def work(session):
+        while True:
+            url = await queue.get()
+            if url is None:
+                return
+            host = urlparse(url).netloc
+            if host not in buckets:
+                buckets[host] = TokenBucket(host_rate, host_burst)
+            try:
+                await asyncio.sleep(random.uniform(*jitter))
+                await buckets[host].acquire()
+                async with in_flight:
+                    html = await fetch_page(session, url, timeout, fetch_executor)
+                products.append(await loop.run_in_executor(parse_executor, parse_amazon_product, html, url))
+            except Exception as e:
+                print(f"Error scraping product from {url}: {e}")
+                failures.append((url, str(e)))
+
+    parse_executor = ProcessPoolExecutor(max_workers=parse_workers or os.cpu_count())
+    fetch_executor = ThreadPoolExecutor(max_workers=concurrency) if aiohttp is None else None
+    session = None
+    if aiohttp is not None:
+        session = aiohttp.ClientSession(headers=REQUEST_HEADERS, connector=aiohttp.TCPConnector(limit=concurrency))
+    try:
+        await asyncio.gather(produce(), *(work(session) for _ in range(workers)))
+    finally:
+        if session is not None:
+            await session.close()
+        if fetch_executor is not None:
+            fetch_executor.shutdown()
+        parse_executor.shutdown()
+    return products, failures
+
+def scrape_products(urls, **options):
+    """Synchronous entry point of scrape_products_async"""
+    return asyncio.run(scrape_products_async(urls, **options))
+
+# Finish a bulk load
+def finish_bulk_load(es, index_name, max_num_segments=1):
+    """
+    Restore the settings after a bulk load, force-merge the index and make all documents searchable
+    An existing index switched to bulk-load mode gets the values saved by create_ecommerce_index back;
+    an index created in bulk-load mode gets NORMAL_SETTINGS.
+    :param es: Elasticsearch client
+    :param index_name: Index loaded with bulk_load=True
+    :param max_num_segments: Segments per shard after the force merge (None skips it)
+    """
+    meta = _index_meta(es, index_name)
+    es.indices.put_settings(index=index_name, settings=meta.get(BULK_LOAD_META_KEY, NORMAL_SETTINGS))
+    if BULK_LOAD_META_KEY in meta:
+        del meta[BULK_LOAD_META_KEY]
+        es.indices.put_mapping(index=index_name, meta=meta)
+    es.indices.refresh(index=index_name)
+    if max_num_segments:
+        # The index no longer receives writes, so merging it down once is worth the wait
+        es.options(request_timeout=3600).indices.forcemerge(index=index_name, max_num_segments=max_num_segments)
+        es.indices.refresh(index=index_name)
+    print(f"Index {index_name} restored to its normal settings and force-merged")
+
+# Rebuild an index behind an alias
+def rebuild_index(es, alias, products, max_failed=0, delete_old=False, **bulk_options):
+    """
+    Load products into a fresh index and atomically point the alias at it
+    Reads keep going to the current index through the alias while the new one is loaded in
+    bulk-load mode; a legacy concrete index named like the alias is replaced in the same
+    alias update.
+    :param es: Elasticsearch client
+    :param alias: Alias that readers query (e.g. 'amazon_products')
+    :param products: Iterable of product dicts
+    :param max_failed: Abort without swapping when more products fail to import
+    :param delete_old: Delete the indices previously behind the alias
+    :param bulk_options: Passed on to bulk_import_to_es (chunk_size, thread_count, ...)
+    :return: Bulk import report plus the new index name and whether the alias was swapped
+    """
+    new_index = f"{alias}-{time.strftime('%Y%m%d%H%M%S', time.gmtime())}"
+    if not create_ecommerce_index(es, new_index, bulk_load=True):
+        return None
+    report = bulk_import_to_es(es, products, new_index, **bulk_options)
+    report['index'] = new_index
+    report['swapped'] = False
+    if report['failed'] > max_failed:
+        print(f"{report['failed']} products failed, keeping alias {alias} on the current index "
+              f"(delete {new_index} or retry)")
+        return report
+    finish_bulk_load(es, new_index)
+    
+    # Swap the alias in one atomic update
+    actions = [{"add": {"index": new_index, "alias": alias}}]
+    old_indices = []
+    if es.indices.exists_alias(name=alias):
+        old_indices = list(es.indices.get_alias(name=alias).body)
+        actions = [{"remove": {"index": index, "alias": alias}} for index in old_indices] + actions
+    elif es.indices.exists(index=alias):
+        # Index created before aliases were used: removed as part of the same update
+        actions = [{"remove_index": {"index": alias}}] + actions
+    es.indices.update_aliases(actions=actions)
+    report['swapped'] = True
+    print(f"Alias {alias} now points to {new_index}")
+    
+    if old_indices:
+        if delete_old:
+            es.indices.delete(index=old_indices)
+            print(f"Deleted previous indices: {', '.join(old_indices)}")
+        else:
+            print(f"Previous indices kept for rollback: {', '.join(old_indices)}")
+    return report
+
 # Import data to Elasticsearch
 def import_to_es(es, product_data, index_name='amazon_products'):
     """Import single product data to Elasticsearch"""
@@ -236,16 +476,264 @@ def import_to_es(es, product_data, index_name='amazon_products'):
         print(f"Error importing to Elasticsearch: {e}")
         return False
 
+# Bulk import to Elasticsearch
+def iter_bulk_actions(products, index_name, report):
+    """Turn product dicts into bulk index actions; products without product_id are counted as skipped"""
+    for product_data in products:
+        if not product_data or not product_data.get('product_id'):
+            report['skipped'] += 1
+            continue
+        # Use product ID as document ID, so re-importing a product overwrites it instead of duplicating it
+        yield {
+            "_op_type": "index",
+            "_index": index_name,
+            "_id": product_data['product_id'],
+            "_source": product_data
+        }
+
+
+def bulk_import_to_es(es, products, index_name='amazon_products', chunk_size=500,
+                      max_chunk_bytes=10 * 1024 * 1024, thread_count=1, max_retries=5,
+                      initial_backoff=2, max_backoff=60):
+    """
+    Import many products with the bulk API
+    Products are streamed in chunks of at most chunk_size documents / max_chunk_bytes bytes.
+    Items rejected with 429 (bulk queue full) are retried with exponential backoff
+    (initial_backoff * 2 ** attempt seconds, capped at max_backoff).
+    With thread_count > 1 chunks are sent by parallel_bulk; its 429 rejections are collected
+    and retried through streaming_bulk afterwards.
+    :param es: Elasticsearch client
+    :param products: Iterable of product dicts (e.g. a generator over scraped pages)
+    :param index_name: Target index
+    :param chunk_size: Documents per bulk request
+    :param max_chunk_bytes: Maximum bytes per bulk request
+    :param thread_count: Concurrent bulk requests
+    :param max_retries: Retries of items rejected with 429
+    :param initial_backoff: Seconds to wait before the first retry
+    :param max_backoff: Maximum seconds between retries
+    :return: Report dict: indexed, failed, skipped, seconds and per failed item its product_id,
+             status and error
+    """
+    report = {"indexed": 0, "failed": 0, "skipped": 0, "seconds": 0.0, "errors": []}
+    actions = iter_bulk_actions(products, index_name, report)
+    start = time.perf_counter()
+
+    def record(ok, item):
+        info = next(iter(item.values()))
+        if ok:
+            report['indexed'] += 1
+        else:
+            report['failed'] += 1
+            report['errors'].append({
+                "product_id": info.get('_id'),
+                "status": info.get('status'),
+                "error": info.get('error') or info.get('exception')
+            })
+
+    def stream(actions):
+        for ok, item in streaming_bulk(es, actions, chunk_size=chunk_size, max_chunk_bytes=max_chunk_bytes,
+                                       max_retries=max_retries, initial_backoff=initial_backoff,
+                                       max_backoff=max_backoff, raise_on_error=False,
+                                       raise_on_exception=False):
+            record(ok, item)
+
+    if thread_count <= 1:
+        stream(actions)
+    else:
+        # parallel_bulk returns results in action order, so the actions still in flight are kept
+        # in a queue (bounded by its chunk queue) to find the ones to retry
+        in_flight = deque()
+
+        def remember(actions):
+            for action in actions:
+                in_flight.append(action)
+                yield action
+
+        rejected = []
+        for ok, item in parallel_bulk(es, remember(actions), thread_count=thread_count, chunk_size=chunk_size,
+                                      max_chunk_bytes=max_chunk_bytes, raise_on_error=False,
+                                      raise_on_exception=False):
+            action = in_flight.popleft()
+            if not ok and next(iter(item.values())).get('status') == 429:
+                rejected.append(action)
+            else:
+                record(ok, item)
+        if rejected:
+            print(f"Retrying {len(rejected)} products rejected with 429")
+            time.sleep(initial_backoff)
+            stream(rejected)
+
+    report['seconds'] = time.perf_counter() - start
+    print(f"Bulk import finished: {report['indexed']} indexed, {report['failed']} failed, "
+          f"{report['skipped']} skipped in {report['seconds']:.2f}s")
+    return report
+
+# Local stand-in for Elasticsearch (benchmarking only)
+class StandInElasticsearch(ThreadingHTTPServer):
+    """
+    Minimal HTTP server answering the Elasticsearch calls used above (ping, index, bulk)
+    Documents are kept in memory by id; reject_rate rejects that fraction of bulk items with 429
+    to exercise the retry path.
+    """
+    daemon_threads = True
+
+    def __init__(self, port=0, reject_rate=0.0, seed=42):
+        super().__init__(('127.0.0.1', port), StandInHandler)
+        self.documents = {}
+        self.requests = 0
+        self.reject_rate = reject_rate
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    # Send headers and body in one segment; written separately, every keep-alive
+    # response would wait ~40 ms for a delayed ACK
+    wbufsize = 64 * 1024
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        pass
+
+    def _respond(self, status, body=None):
+        data = json.dumps(body).encode('utf-8') if body is not None else b''
+        self.send_response(status)
+        # The Python client refuses servers that do not identify as Elasticsearch
+        self.send_header('X-Elastic-Product', 'Elasticsearch')
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        if self.command != 'HEAD':
+            self.wfile.write(data)
+
+    def _read_body(self):
+        return self.rfile.read(int(self.headers.get('Content-Length', 0)))
+
+    def do_HEAD(self):
+        self._respond(200, {})
+
+    def do_GET(self):
+        self._respond(200, {"version": {"number": "9.0.0"}, "tagline": "You Know, for Search"})
+
+    def do_PUT(self):
+        if '/_bulk' in self.path:
+            return self._bulk()
+        # PUT /<index>/_doc/<id>
+        parts = self.path.split('?')[0].strip('/').split('/')
+        document = json.loads(self._read_body())
+        with self.server.lock:
+            self.server.requests += 1
+            result = 'updated' if parts[-1] in self.server.documents else 'created'
+            self.server.documents[parts[-1]] = document
+        self._respond(201 if result == 'created' else 200,
+                      {"_index": parts[0], "_id": parts[-1], "result": result})
+
+    do_POST = do_PUT
+
+    def _bulk(self):
+        # PUT/POST /_bulk: newline-delimited action and source lines
+        lines = self._read_body().splitlines()
+        items = []
+        with self.server.lock:
+            self.server.requests += 1
+            for meta_line, source_line in zip(lines[0::2], lines[1::2]):
+                op_type, meta = next(iter(json.loads(meta_line).items()))
+                if self.server.random.random() < self.server.reject_rate:
+                    items.append({op_type: {"_index": meta['_index'], "_id": meta['_id'], "status": 429,
+                                            "error": {"type": "es_rejected_execution_exception"}}})
+                    continue
+                result = 'updated' if meta['_id'] in self.server.documents else 'created'
+                self.server.documents[meta['_id']] = json.loads(source_line)
+                items.append({op_type: {"_index": meta['_index'], "_id": meta['_id'], "result": result,
+                                        "status": 201 if result == 'created' else 200}})
+        self._respond(200, {"took": 1, "errors": any(next(iter(i.values()))['status'] >= 300 for i in items),
+                            "items": items})
+
+
+def generate_products(n_docs, seed=42):
+    """Synthetic product documents shaped like scrape_amazon_product output"""
+    rng = random.Random(seed)
+    words = "wireless portable kitchen smart fitness outdoor premium compact classic durable".split()
+    for i in range(n_docs):
+        yield {
+            "product_id": f"B{i:09d}",
+            "name": " ".join(rng.choices(words, k=5)).title(),
+            "price": round(rng.uniform(5, 500), 2),
+            "original_price": None,
+            "currency": '$',
+            "category": rng.choice(["Electronics", "Home & Kitchen", "Sports"]),
+            "sub_category": None,
+            "brand": rng.choice(["Acme", "Globex", "Initech"]),
+            "rating": round(rng.uniform(1, 5), 1),
+            "review_count": rng.randint(0, 50000),
+            "description": " ".join(rng.choices(words, k=60)),
+            "features": ", ".join(rng.choices(words, k=5)),
+            "url": f"https://www.amazon.com/dp/B{i:09d}",
+            "image_url": None,
+            "availability": "In Stock",
+            "scraped_at": time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime())
+        }
+
+
+def benchmark_import(n_docs=10000, chunk_size=500, thread_count=4, reject_rate=0.01):
+    """
+    Compare import_to_es (one request per product) with bulk_import_to_es against a local stand-in server
+    Every path imports the same products twice; the second pass must not add documents.
+    :param n_docs: Number of products
+    :param chunk_size: Documents per bulk request
+    :param thread_count: Threads of the parallel bulk path
+    :param reject_rate: Fraction of bulk items the server rejects with 429
+    :return: Results per path
+    """
+    results = {}
+    paths = {
+        "single": lambda es, products: [import_to_es(es, product) for product in products],
+        "streaming_bulk": lambda es, products: bulk_import_to_es(
+            es, products, chunk_size=chunk_size, initial_backoff=0.01),
+        "parallel_bulk": lambda es, products: bulk_import_to_es(
+            es, products, chunk_size=chunk_size, thread_count=thread_count, initial_backoff=0.01),
+    }
+    for name, run in paths.items():
+        server = StandInElasticsearch(reject_rate=0.0 if name == "single" else reject_rate)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        es = Elasticsearch(server.url)
+        try:
+            # Per-document logging of the single path is not part of the measurement
+            with contextlib.redirect_stdout(io.StringIO()):
+                start = time.perf_counter()
+                report = run(es, generate_products(n_docs))
+                seconds = time.perf_counter() - start
+                run(es, generate_products(n_docs))
+        finally:
+            server.shutdown()
+            server.server_close()
+        results[name] = {
+            "docs_per_sec": n_docs / seconds,
+            "requests": server.requests,
+            "documents_stored": len(server.documents),
+        }
+        if isinstance(report, dict):
+            results[name]["failed"] = report['failed']
+    for name in ("streaming_bulk", "parallel_bulk"):
+        results[name]["speedup"] = results[name]["docs_per_sec"] / results["single"]["docs_per_sec"]
+    return results
+
 # Main function
-def main():
+def main(rebuild=False):
     # Initialize Elasticsearch connection
     es = init_elasticsearch()
     if not es:
         return
     
-    # Create index
+    # Create index (a rebuild creates a new index behind the alias instead)
     index_name = 'amazon_products'
-    create_ecommerce_index(es, index_name)
+    if not rebuild:
+        create_ecommerce_index(es, index_name)
     
     # List of Amazon product URLs to scrape
     product_urls = [
@@ -255,24 +743,30 @@ def main():
         "https://www.amazon.com/dp/B09V3KXJPB"
     ]
     
-    # Scrape and import each product
-    for url in product_urls:
-        print(f"\nScraping product from: {url}")
-        product_data = scrape_amazon_product(url)
-        
-        if product_data:
-            print(f"Successfully scraped product: {product_data.get('name')}")
-            import_to_es(es, product_data, index_name)
-        else:
-            print(f"Failed to scrape product from: {url}")
-        
-        # Scrape interval
-        if url != product_urls[-1]:
-            sleep_time = random.uniform(3, 7)
-            print(f"Waiting {sleep_time:.2f} seconds before next scrape...")
-            time.sleep(sleep_time)
+    # Scrape all products concurrently (politeness delays are per host), then import them with the bulk API
+    products, failures = scrape_products(product_urls)
+    for product_data in products:
+        print(f"Successfully scraped product: {product_data.get('name')}")
+    for url, _ in failures:
+        print(f"Failed to scrape product from: {url}")
+    
+    if rebuild:
+        report = rebuild_index(es, index_name, products)
+    else:
+        report = bulk_import_to_es(es, products, index_name)
+    for error in (report or {}).get('errors', []):
+        print(f"Failed to import product {error['product_id']}: {error['status']} {error['error']}")
     
     print("\nAll operations completed")
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="Scrape Amazon products into Elasticsearch")
+    parser.add_argument("--benchmark", type=int, metavar="DOCS",
+                        help="Benchmark single-document vs bulk import against a local stand-in server")
+    parser.add_argument("--rebuild", action="store_true",
+                        help="Load into a new bulk-load index and swap the amazon_products alias to it")
+    args = parser.parse_args()
+    if args.benchmark:
+        print(json.dumps(benchmark_import(args.benchmark), indent=2))
+    else:
+        main(rebuild=args.rebuild)
@@ -0,0 +1,624 @@
+import os
+import sys
+import json
+import time
+import random
+import resource
+import inspect
+import argparse
+import platform
+import subprocess
+import multiprocessing
+from typing import List, Callable
+from llm_data_processing_en import LLMDataCleaner
+
+# ----------------------
+# Synthetic corpus
+# ----------------------
+ENGLISH_WORDS = (
+    "data model training language large dataset quality text web page crawler clean token "
+    "the of and to in is for on with as by at from that this are be it was an or which "
+    "research system network learning results analysis report market city government school"
+).split()
+CHINESE_CHARS = "数据模型训练语言大规模质量文本网页爬虫清洗的是在了和有我们这个中国市场城市政府学校研究系统网络学习结果分析报告"
+URL_TEMPLATES = [
+    "https://example.com/article/{n}?utm_source=feed&utm_campaign={n}",
+    "http://news.example.org/{n}.html",
+    "www.example.net/item/{n}",
+]
+HTML_TEMPLATES = [
+    "<div class=\"post\"><p>{text}</p></div>",
+    "<span>{text}</span><br/>",
+    "<a href=\"/page/{n}\">{text}</a>",
+]
+PII_TEMPLATES = [
+    "Contact john.doe{n}@example.com for details.",
+    "Call 138{n:08d} now.",
+    "ID: 11010119900307{n:04d}",
+    "Card 4111 1111 1111 {n:04d} was charged.",
+    "Dr. John Smith visited Beijing with Microsoft on Monday.",
+]
+JUNK_TEXTS = ["ok", "!!!", "...", "<br/>", "@@@@ ####", "click here", "12345", "###!!!???"]
+
+
+def _english_sentence(rng: random.Random) -> str:
+    words = rng.choices(ENGLISH_WORDS, k=rng.randint(6, 30))
+    return " ".join(words).capitalize() + "."
+
+
+def _chinese_sentence(rng: random.Random) -> str:
+    return "".join(rng.choices(CHINESE_CHARS, k=rng.randint(10, 60))) + "。"
+
+
+def generate_corpus(n_docs: int, seed: int = 42, duplicate_rate: float = 0.15, junk_rate: float = 0.1) -> List[str]:
+    """
+    Generate a deterministic synthetic crawl corpus
+    Mixes English and Chinese documents with URLs, HTML, PII, exact and near duplicates and short junk.
+    :param n_docs: Number of documents
+    :param seed: Random seed (the same seed always gives the same corpus)
+    :param duplicate_rate: Fraction of documents that repeat an earlier one (exactly or with a changed date)
+    :param junk_rate: Fraction of short junk documents
+    :return: List of documents
+    """
+    rng = random.Random(seed)
+    corpus = []
+    for i in range(n_docs):
+        roll = rng.random()
+        if corpus and roll < duplicate_rate:
+            doc = rng.choice(corpus)
+            if rng.random() < 0.5:
+                # Near duplicate: same page with a different date stamp
+                doc = f"{doc} Updated 2024-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}"
+        elif roll < duplicate_rate + junk_rate:
+            doc = rng.choice(JUNK_TEXTS)
+        else:
+            make_sentence = _chinese_sentence if rng.random() < 0.3 else _english_sentence
+            parts = [make_sentence(rng) for _ in range(rng.randint(1, 8))]
+            if rng.random() < 0.3:
+                parts.insert(rng.randint(0, len(parts)), rng.choice(URL_TEMPLATES).format(n=i))
+            if rng.random() < 0.3:
+                parts[0] = rng.choice(HTML_TEMPLATES).format(text=parts[0], n=i)
+            if rng.random() < 0.2:
+                parts.append(rng.choice(PII_TEMPLATES).format(n=i % 10000))
+            doc = " ".join(parts)
+        corpus.append(doc)
+    return corpus
+
+
+# ----------------------
+# Stage measurement
+# ----------------------
+def _peak_rss_mb() -> float:
+    """Peak resident set size of the current process in MB"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is reported in bytes on macOS and in kilobytes elsewhere
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def _reset_peak_rss() -> None:
+    """Lower the peak RSS of the current process to its current RSS (Linux only, otherwise a no-op)"""
+    try:
+        with open('/proc/self/clear_refs', 'w') as clear_refs:
+            clear_refs.write('5')
+    except OSError:
+        pass
+
+
+def _run_stage(stage: Callable, corpus: List[str], conn) -> None:
+    """Run one stage and send its measurements back (executed inside a forked child process)"""
+    # A forked child starts with the parent's pages resident (and on Linux inherits its peak RSS),
+    # so only the growth above the RSS at fork time belongs to the stage
+    _reset_peak_rss()
+    base_rss_mb = _peak_rss_mb()
+    start = time.perf_counter()
+    items_out = stage(corpus)
+    seconds = time.perf_counter() - start
+    conn.send({'seconds': seconds, 'items_out': items_out, 'base_rss_mb': base_rss_mb,
+               'peak_rss_delta_mb': max(_peak_rss_mb() - base_rss_mb, 0.0)})
+    conn.close()
+
+
+def measure_stage(stage: Callable, corpus: List[str]) -> dict:
+    """
+    Run a stage in a forked child process so that its peak memory is measured in isolation
+    Forking shares the corpus with the child, so nothing but the results is pickled. The child
+    starts at the harness's RSS (base_rss_mb); peak_rss_delta_mb is how far the stage raised the
+    peak above it. Where the peak cannot be reset (outside Linux) base_rss_mb is the inherited peak,
+    so the delta may come out too low.
+    :param stage: Callable taking the corpus and returning the number of output items
+    :param corpus: List of documents
+    :return: Measurements (seconds, items_out, base_rss_mb, peak_rss_delta_mb)
+    """
+    context = multiprocessing.get_context('fork')
+    receiver, sender = context.Pipe(duplex=False)
+    process = context.Process(target=_run_stage, args=(stage, corpus, sender))
+    process.start()
+    measured = receiver.recv()
+    process.join()
+    return measured
+
+
+def _load_advanced_cleaner():
+    """Import AdvancedLLMCleaner if its dependencies are installed, else return None"""
+    try:
+        from llm_data_process_advanced import AdvancedLLMCleaner
+        return AdvancedLLMCleaner()
+    except (ImportError, OSError) as e:
+        print(f"Skipping AdvancedLLMCleaner stages: {e}")
+        return None
+
+
+def build_stages(cleaner: LLMDataCleaner, advanced=None) -> dict:
+    """
+    Build the benchmarked stages; each stage takes the corpus and returns the number of output items
+    :param cleaner: LLMDataCleaner instance
+    :param advanced: Optional AdvancedLLMCleaner instance
+    :return: Mapping of stage name to callable
+    """
+    stages = {
+        'remove_duplicates': lambda corpus: len(cleaner.remove_duplicates(corpus)[0]),
+        'clean_special_characters': lambda corpus: len([cleaner.clean_special_characters(t) for t in corpus]),
+        'clean_special_characters_fast': lambda corpus: len([cleaner.clean_special_characters_fast(t) for t in corpus]),
+        'filter_low_quality_texts': lambda corpus: len(cleaner.filter_low_quality_texts(corpus)[0]),
+        'process_batch': lambda corpus: len(cleaner.process_batch(corpus)[0]),
+    }
+    if advanced is not None:
+        stages['desensitize_text'] = lambda corpus: sum(
+            1 for t in corpus if advanced.desensitize_text(t, cleaner.detect_language(t)))
+        stages['split_long_text'] = lambda corpus: sum(
+            len(advanced.split_long_text(t, cleaner.detect_language(t))) for t in corpus)
+
+        def group_by_language(corpus):
+            groups = {}
+            for t in corpus:
+                groups.setdefault(cleaner.detect_language(t), []).append(t)
+            return groups.items()
+        stages['split_long_texts'] = lambda corpus: sum(
+            len(chunks) for lang, group in group_by_language(corpus)
+            for chunks in advanced.split_long_texts(group, lang))
+        stages['desensitize_texts'] = lambda corpus: sum(
+            sum(1 for t in advanced.desensitize_texts(group, lang) if t)
+            for lang, group in group_by_language(corpus))
+    return stages
+
+
+def bench_pipeline(n_docs: int = 100000, seed: int = 42, stage_names: List[str] = None) -> dict:
+    """
+    Measure per-stage throughput and peak memory on the synthetic corpus
+    Every stage runs in its own forked child process so that peak memory growth is attributed per stage.
+    :param n_docs: Number of documents
+    :param seed: Random seed
+    :param stage_names: Stages to run (all available stages if None)
+    :return: Benchmark results keyed by stage name
+    """
+    corpus = generate_corpus(n_docs, seed)
+    corpus_mb = sum(len(doc.encode('utf-8')) for doc in corpus) / (1024 * 1024)
+    stages = build_stages(LLMDataCleaner(), _load_advanced_cleaner())
+
+    results = {}
+    for name, stage in stages.items():
+        if stage_names and name not in stage_names:
+            continue
+        measured = measure_stage(stage, corpus)
+        results[name] = {
+            'docs_in': n_docs,
+            'items_out': measured['items_out'],
+            'seconds': measured['seconds'],
+            'docs_per_sec': n_docs / measured['seconds'],
+            'mb_per_sec': corpus_mb / measured['seconds'],
+            'base_rss_mb': measured['base_rss_mb'],
+            'peak_rss_delta_mb': measured['peak_rss_delta_mb'],
+        }
+    return results
+
+
+# ----------------------
+# Comparison benchmarks
+# ----------------------
+def time_call(func, texts: list) -> float:
+    """Run func over every text and return the elapsed seconds"""
+    start = time.perf_counter()
+    for text in texts:
+        func(text)
+    return time.perf_counter() - start
+
+
+def bench_clean_special_characters(n_docs: int = 100000, seed: int = 42) -> dict:
+    """
+    Compare clean_special_characters against the compiled engine
+    :param n_docs: Number of documents
+    :param seed: Random seed
+    :return: Benchmark results
+    """
+    cleaner = LLMDataCleaner()
+    texts = generate_corpus(n_docs, seed)
+
+    # Both implementations must agree byte for byte before timing them
+    for text in texts[:10000]:
+        assert cleaner.clean_special_characters(text) == cleaner.clean_special_characters_fast(text), text
+
+    baseline = time_call(cleaner.clean_special_characters, texts)
+    fast = time_call(cleaner.clean_special_characters_fast, texts)
+    return {
+        'docs': n_docs,
+        'baseline_docs_per_sec': n_docs / baseline,
+        'fast_docs_per_sec': n_docs / fast,
+        'speedup': baseline / fast
+    }
+
+
+def bench_stopwords(n_docs: int = 1000000, seed: int = 42) -> dict:
+    """
+    Compare NLTK word_tokenize stop word removal against the regex batch path
+    :param n_docs: Number of sentences
+    :param seed: Random seed
+    :return: Benchmark results
+    """
+    cleaner = LLMDataCleaner()
+    rng = random.Random(seed)
+    sentences = [_english_sentence(rng) for _ in range(n_docs)]
+
+    start = time.perf_counter()
+    cleaner.remove_stopwords_batch(sentences)
+    fast = time.perf_counter() - start
+    result = {'docs': n_docs, 'regex_docs_per_sec': n_docs / fast}
+
+    try:
+        nltk_time = time_call(cleaner.remove_stopwords, sentences)
+    except LookupError:
+        # Punkt models are not installed and could not be downloaded
+        print("Skipping NLTK backend: punkt tokenizer is not available")
+    else:
+        result['nltk_docs_per_sec'] = n_docs / nltk_time
+        result['speedup'] = nltk_time / fast
+    return result
+
+
+# ----------------------
+# Start-up benchmark
+# ----------------------
+SAMPLE_TEXT = "Dr. John Smith (john.smith@example.com) spoke about AI in Beijing. Call 13800138000."
+
+# Entry points measured from a cold interpreter: statement run after creating `cleaner`
+STARTUP_ENTRY_POINTS = {
+    'import': "pass",
+    'detect_language_advanced': "cleaner.detect_language_advanced(text)",
+    'desensitize_text': "cleaner.desensitize_text(text, 'en')",
+    'split_long_text': "cleaner.split_long_text(text, 'en')",
+    'filter_semantic_quality': "cleaner.filter_semantic_quality([text])",
+}
+
+STARTUP_SCRIPT = """
+import json, resource, sys, time
+sys.path.insert(0, {root!r})
+
+def _peak_rss_mb():
+    # ru_maxrss survives fork/exec on Linux, so read the high-water mark of this image instead
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+start = time.perf_counter()
+import llm_data_process_advanced
+from llm_data_process_advanced import AdvancedLLMCleaner
+import_seconds = time.perf_counter() - start
+import_rss_mb = _peak_rss_mb()
+cleaner = AdvancedLLMCleaner()
+text = {text!r}
+start = time.perf_counter()
+{statement}
+first_call_seconds = time.perf_counter() - start
+print(json.dumps({{
+    'import_seconds': import_seconds,
+    'import_rss_mb': import_rss_mb,
+    'first_call_seconds': first_call_seconds,
+    'peak_rss_mb': _peak_rss_mb(),
+    'models_loaded': llm_data_process_advanced.models.loaded(),
+}}))
+"""
+
+
+def bench_startup(n_docs: int = None, seed: int = None) -> dict:
+    """
+    Measure cold-start time and peak RSS of each llm_data_process_advanced entry point
+    Every entry point runs in a fresh interpreter so that only the models it needs are loaded.
+    :param n_docs: Unused (kept for the common benchmark signature)
+    :param seed: Unused
+    :return: Benchmark results keyed by entry point
+    """
+    root = os.path.dirname(os.path.abspath(__file__))
+    results = {}
+    for name, statement in STARTUP_ENTRY_POINTS.items():
+        script = STARTUP_SCRIPT.format(root=root, text=SAMPLE_TEXT, statement=statement)
+        completed = subprocess.run([sys.executable, '-c', script], capture_output=True, text=True)
+        if completed.returncode != 0:
+            error = completed.stderr.strip().splitlines()
+            results[name] = {'error': error[-1] if error else f"exit code {completed.returncode}"}
+            continue
+        # The measurements are the last stdout line; model warnings may precede it
+        results[name] = json.loads(completed.stdout.strip().splitlines()[-1])
+    return results
+
+
+# ----------------------
+# Language identification benchmark
+# ----------------------
+BOILERPLATE_LINES = [
+    "Copyright © 2024 Example Inc. All rights reserved.",
+    "Home | About | Contact | Privacy Policy",
+    "Share this article on Twitter and Facebook",
+    "版权所有 © 2024 示例公司 保留所有权利",
+    "Click here to subscribe to our newsletter",
+]
+
+
+def bench_langid(n_docs: int = 1000000, seed: int = 42, batch_size: int = 10000, baseline_sample: int = 10000) -> dict:
+    """
+    Compare per-line detect_language_advanced against the cached batch detect_languages
+    Lines mix crawl documents with repeated boilerplate. The per-line baseline (without cache)
+    runs on the first baseline_sample lines only and is reported as a rate.
+    :param n_docs: Number of lines
+    :param seed: Random seed
+    :param batch_size: Lines per detect_languages call
+    :param baseline_sample: Lines timed with the per-line baseline
+    :return: Benchmark results
+    """
+    from langdetect import DetectorFactory
+    from llm_data_process_advanced import AdvancedLLMCleaner
+    DetectorFactory.seed = 0  # langdetect is randomised; make both runs comparable
+
+    rng = random.Random(seed)
+    lines = [rng.choice(BOILERPLATE_LINES) if rng.random() < 0.2 else doc for doc in generate_corpus(n_docs, seed)]
+
+    sample = lines[:baseline_sample]
+    baseline_cleaner = AdvancedLLMCleaner(language_cache_size=0)
+    start = time.perf_counter()
+    expected = [baseline_cleaner.detect_language_advanced(line) for line in sample]
+    baseline = time.perf_counter() - start
+
+    cleaner = AdvancedLLMCleaner()
+    workers = os.cpu_count() or 1
+    detected = []
+    start = time.perf_counter()
+    for i in range(0, len(lines), batch_size):
+        detected.extend(cleaner.detect_languages(lines[i:i + batch_size], workers=workers))
+    batched = time.perf_counter() - start
+
+    cache = cleaner.language_cache
+    lookups = cache.hits + cache.misses
+    return {
+        'lines': n_docs,
+        'workers': workers,
+        'baseline_lines_per_sec': len(sample) / baseline,
+        'batched_lines_per_sec': n_docs / batched,
+        'speedup': (n_docs / batched) / (len(sample) / baseline),
+        'cache_hit_rate': cache.hits / lookups if lookups else 0.0,
+        'agreement': sum(a[0] == b[0] for a, b in zip(expected, detected)) / len(sample),
+    }
+
+
+# ----------------------
+# Semantic quality benchmark
+# ----------------------
+def bench_semantic(n_docs: int = 2000, seed: int = 42, threshold: float = 0.7) -> dict:
+    """
+    Compare fixed 32-text slices through the quality pipeline (the previous implementation,
+    with truncation added so long texts do not fail) against length-bucketed dynamic batching
+    on each available backend
+    :param n_docs: Number of documents
+    :param seed: Random seed
+    :param threshold: Quality threshold
+    :return: Benchmark results keyed by path
+    """
+    import torch
+    from llm_data_process_advanced import AdvancedLLMCleaner, QUALITY_BACKENDS, models
+    torch.manual_seed(seed)  # the classification head is freshly initialised
+    texts = generate_corpus(n_docs, seed)
+    cleaner = AdvancedLLMCleaner()
+
+    quality_pipeline = models.get("quality_pipeline")
+    start = time.perf_counter()
+    expected = []
+    for i in range(0, len(texts), 32):
+        batch = texts[i:i + 32]
+        for text, res in zip(batch, quality_pipeline(batch, truncation=True)):
+            if res["label"] == "LABEL_1" and res["score"] >= threshold:
+                expected.append(text)
+    baseline = time.perf_counter() - start
+    results = {'fixed_batches': {'docs_per_sec': n_docs / baseline, 'kept': len(expected)}}
+
+    for backend in QUALITY_BACKENDS:
+        try:
+            models.get(QUALITY_BACKENDS[backend])  # load outside the timed region
+        except Exception as e:
+            results[backend] = {'error': f"{type(e).__name__}: {e}"}
+            continue
+        start = time.perf_counter()
+        kept = cleaner.filter_semantic_quality(texts, threshold, backend=backend)
+        seconds = time.perf_counter() - start
+        expected_set = set(expected)
+        results[backend] = {
+            'docs_per_sec': n_docs / seconds,
+            'speedup': baseline / seconds,
+            'kept': len(kept),
+            'agreement': sum(text in expected_set for text in kept) / max(len(kept), len(expected), 1),
+        }
+
+    # Heuristic cascade in front of the classifier, auditing 10% of the heuristic decisions
+    start = time.perf_counter()
+    kept, stats = cleaner.filter_quality_cascade(texts, threshold, audit_rate=0.1, seed=seed)
+    seconds = time.perf_counter() - start
+    results['cascade'] = {'docs_per_sec': n_docs / seconds, 'speedup': baseline / seconds, **stats}
+    return results
+
+
+# ----------------------
+# Cross-language noise benchmark
+# ----------------------
+def _legacy_remove_cross_lang_noise(text: str) -> str:
+    """The previous implementation: one str.replace over the whole text per short English word"""
+    import re
+    for word in re.findall(r'[A-Za-z]+', text):
+        if len(word) < 3 and word.lower() not in {"ai", "it", "gdp"}:
+            text = text.replace(word, "")
+    return text
+
+
+def bench_crosslang(n_docs: int = 100000, seed: int = 42, page_sentences: int = 500,
+                    baseline_sample: int = 20) -> dict:
+    """
+    Compare the previous per-word str.replace noise removal against the single-pass regex
+    on long Chinese pages with embedded English sentences and terms
+    :param n_docs: Total number of sentences (grouped into pages of page_sentences)
+    :param seed: Random seed
+    :param page_sentences: Sentences per page
+    :param baseline_sample: Pages timed with the previous implementation
+    :return: Benchmark results
+    """
+    from llm_data_process_advanced import AdvancedLLMCleaner
+    rng = random.Random(seed)
+    terms = ["AI", "IT", "GDP", "an", "ok", "x", "Shanghai", "Python", "CPU"]
+    pages = []
+    for _ in range(max(1, n_docs // page_sentences)):
+        parts = []
+        for _ in range(page_sentences):
+            if rng.random() < 0.3:
+                parts.append(_english_sentence(rng))
+            else:
+                parts.append(_chinese_sentence(rng) + rng.choice(terms))
+        pages.append("".join(parts))
+    page_mb = sum(len(page.encode('utf-8')) for page in pages) / 1024 / 1024
+
+    sample = pages[:baseline_sample]
+    start = time.perf_counter()
+    expected = [_legacy_remove_cross_lang_noise(page) for page in sample]
+    baseline = time.perf_counter() - start
+
+    cleaner = AdvancedLLMCleaner()
+    start = time.perf_counter()
+    cleaned = cleaner.remove_cross_lang_noise_texts(pages, "zh")
+    fast = time.perf_counter() - start
+
+    return {
+        'pages': len(pages),
+        'page_kb': page_mb * 1024 / len(pages),
+        'baseline_pages_per_sec': len(sample) / baseline,
+        'fast_pages_per_sec': len(pages) / fast,
+        'fast_mb_per_sec': page_mb / fast,
+        'speedup': (len(pages) / fast) / (len(sample) / baseline),
+        # The previous implementation also deleted letters inside longer words ("an" in "Shanghai")
+        'baseline_differs': sum(a != b for a, b in zip(expected, cleaned)) / len(sample),
+    }
+
+
+# ----------------------
+# Scaling benchmark
+# ----------------------
+def bench_scaling(n_docs: int = 100000, seed: int = 42, schedulers: List[str] = None,
+                  block_size: int = 1024 * 1024) -> dict:
+    """
+    Measure distributed_clean throughput from 1 to N workers for each scheduler
+    Worker counts double from 1 up to the number of CPUs (which is always included).
+    :param n_docs: Number of input lines
+    :param seed: Random seed
+    :param schedulers: Schedulers to compare (default: threads, processes and distributed if installed)
+    :param block_size: Input block size, small enough to give every worker several blocks
+    :return: Benchmark results keyed by scheduler, then worker count
+    """
+    import shutil
+    import tempfile
+    from pipeline_metrics import StageMetrics
+    from llm_data_process_advanced import AdvancedLLMCleaner, SCHEDULERS
+
+    cpus = os.cpu_count() or 1
+    worker_counts = sorted({min(1 << i, cpus) for i in range(cpus.bit_length() + 1)})
+    cleaner = AdvancedLLMCleaner()
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        input_path = os.path.join(tmp_dir, 'corpus.txt')
+        with open(input_path, 'w', encoding='utf-8') as f:
+            for doc in generate_corpus(n_docs, seed):
+                f.write(doc.replace('\n', ' ') + '\n')
+        input_mb = os.path.getsize(input_path) / (1024 * 1024)
+        output_dir = os.path.join(tmp_dir, 'cleaned')
+
+        for scheduler in schedulers or SCHEDULERS:
+            results[scheduler] = {}
+            for workers in worker_counts:
+                shutil.rmtree(output_dir, ignore_errors=True)
+                metrics = StageMetrics()
+                start = time.perf_counter()
+                try:
+                    cleaner.distributed_clean([input_path], metrics=metrics, block_size=block_size,
+                                              scheduler=scheduler, workers=workers, output_dir=output_dir)
+                except ImportError as e:
+                    results[scheduler] = {'error': str(e).splitlines()[0]}
+                    break
+                seconds = time.perf_counter() - start
+                single = results[scheduler].get(1, {}).get('seconds', seconds)
+                results[scheduler][workers] = {
+                    'seconds': seconds,
+                    'docs_per_sec': n_docs / seconds,
+                    'mb_per_sec': input_mb / seconds,
+                    'speedup': single / seconds,
+                    'efficiency': single / seconds / workers,
+                    'chunks_out': metrics.report().get('split_long_text', {}).get('items_out', 0),
+                }
+    return results
+
+
+BENCHMARKS = {
+    'pipeline': bench_pipeline,
+    'startup': bench_startup,
+    'langid': bench_langid,
+    'semantic': bench_semantic,
+    'scaling': bench_scaling,
+    'crosslang': bench_crosslang,
+    'clean': bench_clean_special_characters,
+    'stopwords': bench_stopwords,
+}
+
+
+def _git_commit() -> str:
+    """Current git commit of the working tree (None outside a git checkout)"""
+    try:
+        return subprocess.check_output(['git', 'rev-parse', 'HEAD'], cwd=os.path.dirname(os.path.abspath(__file__)),
+                                       stderr=subprocess.DEVNULL, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark LLM data cleaning stages")
+    parser.add_argument("--suite", choices=sorted(BENCHMARKS), default='pipeline', help="Benchmark to run")
+    parser.add_argument("--docs", type=int, help="Number of synthetic documents (default: the suite's own)")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed")
+    parser.add_argument("--output", default="benchmark_results.json", help="Machine-readable results file")
+    args = parser.parse_args()
+
+    benchmark = BENCHMARKS[args.suite]
+    # Without --docs every suite keeps its own default size (e.g. 1M sentences for stopwords)
+    if args.docs is None:
+        args.docs = inspect.signature(benchmark).parameters['n_docs'].default
+    result = benchmark(args.docs, args.seed)
+    print(f"{args.suite} benchmark:")
+    print(json.dumps(result, indent=2, ensure_ascii=False))
+
+    report = {
+        'suite': args.suite,
+        'docs': args.docs,
+        'seed': args.seed,
+        'commit': _git_commit(),
+        'python': platform.python_version(),
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+        'results': result,
+    }
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+    print(f"Results written to {args.output}")
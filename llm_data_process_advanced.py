@@ -1,57 +1,343 @@
+import os
+import sys
 import re
+import random
 import string
+import itertools
 import hashlib
-import spacy
-import fasttext
-import dask.bag as db
-from dask.diagnostics import ProgressBar
-from typing import List, Tuple, Dict
-import torch
-from transformers import AutoTokenizer, AutoModelForSequenceClassification, pipeline
-import numpy as np
+import importlib
+import threading
+import multiprocessing
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Tuple, Dict, Iterable, Iterator, Callable, Any
 from langdetect import detect, LangDetectException
+from pipeline_metrics import StageMetrics, NULL_METRICS
+from score_cache import ScoreCache
+from text_blocks import DEFAULT_BLOCK_SIZE, plan_blocks, iter_block_records
+from run_manifest import RunManifest, OUTPUT_PREFIX, block_id, input_fingerprint
+from shard_io import WRITERS, DEFAULT_SHARD_SIZE
+
+# Optional Aho-Corasick automaton for keyword screening (pip install pyahocorasick)
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
 
 # ----------------------
 # Resource Initialization
 # ----------------------
-# Load NLP models (download first if needed)
-# spacy download en_core_web_lg
-# spacy download zh_core_web_lg
-try:
-    nlp_en = spacy.load("en_core_web_lg")  # For English NER and parsing
-    nlp_zh = spacy.load("zh_core_web_lg")  # For Chinese NER
-except:
-    print("Warning: SpaCy models not found. Sensitive info detection may be limited.")
-    nlp_en = None
-    nlp_zh = None
-
-# FastText for language detection (more accurate than regex)
-# Download model: https://dl.fbaipublicfiles.com/fasttext/supervised-models/lid.176.bin
-try:
-    ft_model = fasttext.load_model('lid.176.bin')
-except:
-    print("Warning: FastText model not found. Using fallback language detection.")
-    ft_model = None
+# Heavy libraries (spaCy, fastText, torch/transformers, Dask) are imported and their
+# models loaded lazily on first use, so importing this module stays fast.
+class ModelRegistry:
+    """
+    Thread-safe registry that loads each model once, on first use
+    Loaders may return None when a model is unavailable; the None is cached as well,
+    so callers fall back without retrying the load on every call.
+    """
+    def __init__(self):
+        self._loaders = {}
+        self._models = {}
+        self._lock = threading.Lock()
+        self._model_locks = {}
+
+    def register(self, name: str, loader: Callable[[], Any]) -> None:
+        """
+        Register a model loader
+        :param name: Model name
+        :param loader: Zero-argument callable returning the loaded model (or None if unavailable)
+        """
+        with self._lock:
+            self._loaders[name] = loader
+            self._model_locks[name] = threading.Lock()
+
+    def get(self, name: str) -> Any:
+        """
+        Return a model, loading it on first access
+        :param name: Model name
+        :return: Loaded model, or None if it is unavailable
+        """
+        if name in self._models:
+            return self._models[name]
+        if name not in self._loaders:
+            raise KeyError(f"Unknown model '{name}', registered: {sorted(self._loaders)}")
+        # Per-model lock: concurrent callers wait for one load instead of loading twice,
+        # while loads of different models can proceed in parallel
+        with self._model_locks[name]:
+            if name not in self._models:
+                self._models[name] = self._loaders[name]()
+        return self._models[name]
+
+    def is_loaded(self, name: str) -> bool:
+        return name in self._models
+
+    def loaded(self) -> List[str]:
+        """Names of the models loaded so far"""
+        return sorted(self._models)
+
+    def preload(self, names: Iterable[str]) -> None:
+        """Load the given models now (e.g. at worker start-up)"""
+        for name in names:
+            self.get(name)
+
+
+class LRUCache:
+    """
+    Bounded, thread-safe least-recently-used cache
+    Pickling keeps only the size limit, so copies shipped to worker processes start empty.
+    """
+    def __init__(self, maxsize: int = 100000):
+        """
+        :param maxsize: Maximum number of entries (0 disables caching)
+        """
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            try:
+                value = self._data[key]
+            except KeyError:
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def record_hits(self, count: int) -> None:
+        """Count lookups answered without consulting the cache (e.g. repeats within one batch) as hits"""
+        with self._lock:
+            self.hits += count
+
+    def put(self, key, value) -> None:
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            if len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __getstate__(self) -> dict:
+        return {"maxsize": self.maxsize}
+
+    def __setstate__(self, state: dict) -> None:
+        self.__init__(state["maxsize"])
+
+
+def _load_spacy(model_name: str):
+    # Load NLP models (download first if needed)
+    # spacy download en_core_web_lg
+    # spacy download zh_core_web_lg
+    try:
+        import spacy
+        return spacy.load(model_name)
+    except (ImportError, OSError):
+        print(f"Warning: SpaCy model {model_name} not found. Sensitive info detection may be limited.")
+        return None
+
+
+def _load_fasttext_lid():
+    # FastText for language detection (more accurate than regex)
+    # Download model: https://dl.fbaipublicfiles.com/fasttext/supervised-models/lid.176.bin
+    try:
+        import fasttext
+        return fasttext.load_model('lid.176.bin')
+    except (ImportError, ValueError, OSError):
+        print("Warning: FastText model not found. Using fallback language detection.")
+        return None
+
+
+def _load_spacy_chunker(base_model: str):
+    """
+    Lightweight pipeline for chunking: the base model's tokenizer and vocab plus a rule-based
+    sentencizer, without the tagger/parser/NER components (shares memory with the base model)
+    """
+    nlp = models.get(base_model)
+    if nlp is None:
+        return None
+    import spacy
+    chunker = spacy.blank(nlp.lang, vocab=nlp.vocab)
+    chunker.tokenizer = nlp.tokenizer
+    chunker.add_pipe("sentencizer")
+    return chunker
+
+
+def make_token_counter(tokenizer) -> Callable[[List[str]], List[int]]:
+    """
+    Build a batched token counter from a Hugging Face (fast) tokenizer, for split_long_text
+    :param tokenizer: Tokenizer of the target model
+    :return: Callable mapping a list of sentences to their token counts
+    """
+    def count_tokens(sentences: List[str]) -> List[int]:
+        if not sentences:
+            return []
+        encoded = tokenizer(sentences, add_special_tokens=False)["input_ids"]
+        return [len(ids) for ids in encoded]
+    return count_tokens
+
+
+def _load_langdetect():
+    # langdetect loads its language profiles lazily into a global on first detect(), which is
+    # not thread-safe; loading through the registry makes it happen exactly once
+    from langdetect.detector_factory import init_factory
+    init_factory()
+    return True
+
 
 # Load quality assessment model (assesses text coherence/information density)
 quality_model_name = "microsoft/xtremedistil-l6-h384-uncased"
-quality_tokenizer = AutoTokenizer.from_pretrained(quality_model_name)
-quality_model = AutoModelForSequenceClassification.from_pretrained(
-    quality_model_name, 
-    num_labels=2  # 0: low quality, 1: high quality (fine-tuned on custom data)
-)
-quality_pipeline = pipeline(
-    "text-classification",
-    model=quality_model,
-    tokenizer=quality_tokenizer,
-    device=0 if torch.cuda.is_available() else -1
-)
+# Bump when the classifier weights change (e.g. after fine-tuning) to invalidate cached scores
+QUALITY_MODEL_VERSION = "base"
+
+
+def _load_quality_pipeline(backend: str = "torch"):
+    """
+    Build the quality classification pipeline
+    :param backend: 'torch', 'int8' (dynamically quantized Linear layers, CPU) or
+                    'onnx' (ONNX Runtime CPU via optimum, falls back to 'torch' if not installed)
+    """
+    import torch
+    from transformers import AutoTokenizer, AutoModelForSequenceClassification, pipeline
+    quality_tokenizer = AutoTokenizer.from_pretrained(quality_model_name)
+    quality_model = AutoModelForSequenceClassification.from_pretrained(
+        quality_model_name, 
+        num_labels=2  # 0: low quality, 1: high quality (fine-tuned on custom data)
+    )
+    device = 0 if torch.cuda.is_available() else -1
+
+    if backend == "int8":
+        quality_model = torch.quantization.quantize_dynamic(quality_model, {torch.nn.Linear}, dtype=torch.qint8)
+        device = -1  # quantized kernels run on CPU only
+    elif backend == "onnx":
+        try:
+            import tempfile
+            from optimum.onnxruntime import ORTModelForSequenceClassification
+        except ImportError:
+            print("Warning: optimum[onnxruntime] not installed. Using the PyTorch quality model.")
+            return models.get("quality_pipeline")
+        # Export this exact model (including its classification head) to ONNX
+        with tempfile.TemporaryDirectory() as model_dir:
+            quality_model.save_pretrained(model_dir)
+            quality_tokenizer.save_pretrained(model_dir)
+            quality_model = ORTModelForSequenceClassification.from_pretrained(model_dir, export=True)
+        device = -1
+
+    return pipeline(
+        "text-classification",
+        model=quality_model,
+        tokenizer=quality_tokenizer,
+        device=device
+    )
+
+
+models = ModelRegistry()
+models.register("spacy_en", lambda: _load_spacy("en_core_web_lg"))  # For English NER and parsing
+models.register("spacy_zh", lambda: _load_spacy("zh_core_web_lg"))  # For Chinese NER
+models.register("spacy_en_chunker", lambda: _load_spacy_chunker("spacy_en"))
+models.register("spacy_zh_chunker", lambda: _load_spacy_chunker("spacy_zh"))
+models.register("fasttext_lid", _load_fasttext_lid)
+models.register("langdetect", _load_langdetect)
+models.register("quality_pipeline", _load_quality_pipeline)
+models.register("quality_pipeline_int8", lambda: _load_quality_pipeline("int8"))
+models.register("quality_pipeline_onnx", lambda: _load_quality_pipeline("onnx"))
+
+# Dask schedulers supported by distributed_clean
+SCHEDULERS = ("threads", "processes", "distributed")
+
+# Registry entries of the filter_semantic_quality backends
+QUALITY_BACKENDS = {
+    "torch": "quality_pipeline",
+    "int8": "quality_pipeline_int8",
+    "onnx": "quality_pipeline_onnx",
+}
+
+# Heuristic quality cascade run before the classifier: clear cases are decided by cheap
+# features, only the ambiguous middle band is scored by the model
+DEFAULT_CASCADE_CONFIG = {
+    # Reject when any of these fails
+    "min_words": 3,
+    "max_symbol_ratio": 0.3,
+    "max_repetition": 0.3,
+    "min_stopword_density": 0.05,
+    "min_language_confidence": 0.5,
+    # Accept when all of these hold
+    "accept_min_words": 20,
+    "accept_min_stopword_density": 0.2,
+    "accept_max_symbol_ratio": 0.1,
+    "accept_max_repetition": 0.1,
+    "accept_min_language_confidence": 0.8,
+}
+# Words: single CJK characters or runs of other letters/digits
+CASCADE_WORD_PATTERN = re.compile(r'[\u4e00-\u9fff]|[^\W_\u4e00-\u9fff]+')
+CASCADE_STOPWORDS = frozenset(
+    "the of and to a in is it that for on with as was be by this are at from or an have not but "
+    "you he she they we i his her their my your how what which who will can there".split()
+) | frozenset("的了是在和有我他她这那个们也就都而及与着或之于")
+# Languages covered by CASCADE_STOPWORDS; the stop word rules only apply to these
+CASCADE_STOPWORD_LANGUAGES = ("en", "zh")
+
+# Short Latin words in Chinese text: a whole run of ASCII letters (never part of a longer word)
+# of at most two letters, so "an" is matched on its own but not inside "Shanghai"
+CROSS_LANG_NOISE_PATTERN = re.compile(r'(?<![A-Za-z])[A-Za-z]{1,2}(?![A-Za-z])')
+
+# Legacy module attributes, resolved lazily through the registry
+_LEGACY_MODEL_ATTRIBUTES = {
+    "nlp_en": "spacy_en",
+    "nlp_zh": "spacy_zh",
+    "ft_model": "fasttext_lid",
+    "quality_pipeline": "quality_pipeline",
+}
+
+
+def __getattr__(name: str):
+    if name in _LEGACY_MODEL_ATTRIBUTES:
+        return models.get(_LEGACY_MODEL_ATTRIBUTES[name])
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def _spacy_for(lang: str):
+    """spaCy pipeline for a language code ('en'/'zh'), or None"""
+    if lang == "en":
+        return models.get("spacy_en")
+    if lang == "zh":
+        return models.get("spacy_zh")
+    return None
 
 # ----------------------
 # Advanced Cleaner Class
 # ----------------------
 class AdvancedLLMCleaner:
-    def __init__(self):
+    # Models used by each entry point
+    MODEL_REQUIREMENTS = {
+        "detect_language_advanced": ("fasttext_lid", "langdetect"),
+        "split_long_text": ("spacy_en_chunker", "spacy_zh_chunker"),
+        "desensitize_text": ("spacy_en", "spacy_zh"),
+        "filter_semantic_quality": ("quality_pipeline",),
+        "remove_cross_lang_noise": ("fasttext_lid",),
+        "distributed_clean": ("fasttext_lid", "langdetect", "spacy_en", "spacy_zh",
+                              "spacy_en_chunker", "spacy_zh_chunker"),
+    }
+
+    def __init__(self, required_models: Iterable[str] = (), preload: bool = False,
+                 language_cache_size: int = 100000, score_cache: ScoreCache = None):
+        """
+        :param required_models: Models (or entry point names from MODEL_REQUIREMENTS) this cleaner needs
+        :param preload: Load the required models immediately instead of on first use
+        :param language_cache_size: Number of language detection results kept in the LRU cache
+        :param score_cache: Optional persistent cache of language ID, quality and NER outputs across runs
+        """
+        self.required_models = self._resolve_models(required_models)
+        self.language_cache = LRUCache(language_cache_size)
+        self.score_cache = score_cache
+        if preload:
+            self.preload_models()
         # Sensitive pattern database (extended)
         self.sensitive_patterns = {
             "email": r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b',
@@ -61,44 +347,177 @@ class AdvancedLLMCleaner:
         }
         # Harmful keywords (example categories)
         self.harmful_keywords = {"violence", "discrimination", "hate", "terrorism"}
+        # Entity labels redacted by NER (GPE: countries/cities)
+        self.redacted_entity_labels = {"PERSON", "GPE", "ORG", "DATE"}
+        # Short English words kept in Chinese text by remove_cross_lang_noise (lowercase)
+        self.cross_lang_allowlist = {"ai", "it", "gdp"}
+        # Compiled matchers, rebuilt when the patterns/keywords above are changed
+        self._pii_matcher = (None, None, None)
+        self._keyword_matcher = (None, None)
+
+    def __getstate__(self) -> dict:
+        # Compiled matchers hold closures; worker copies rebuild them on first use
+        state = dict(self.__dict__)
+        state["_pii_matcher"] = (None, None, None)
+        state["_keyword_matcher"] = (None, None)
+        return state
+
+    def _resolve_models(self, names: Iterable[str]) -> Tuple[str, ...]:
+        """Expand entry point names into model names, keeping order and dropping repeats"""
+        resolved = []
+        for name in names:
+            for model_name in self.MODEL_REQUIREMENTS.get(name, (name,)):
+                if model_name not in resolved:
+                    resolved.append(model_name)
+        return tuple(resolved)
+
+    def preload_models(self, names: Iterable[str] = None) -> None:
+        """
+        Load models ahead of time
+        :param names: Models or entry point names (defaults to the declared required_models)
+        """
+        models.preload(self._resolve_models(names) if names is not None else self.required_models)
 
     def detect_language_advanced(self, text: str) -> Tuple[str, float]:
         """
         Advanced language detection with confidence score
         Returns (language code, confidence)
         """
-        if not text.strip():
-            return ("unknown", 0.0)
-        
-        try:
-            if ft_model:
-                predictions = ft_model.predict(text, k=1)
-                lang = predictions[0][0].replace("__label__", "")
-                confidence = predictions[1][0]
-                return (lang, confidence)
+        return self.detect_languages([text])[0]
+
+    def detect_languages(self, texts: List[str], workers: int = 1) -> List[Tuple[str, float]]:
+        """
+        Batch language detection with confidence scores
+        Results are cached by text hash, repeated texts are detected once, and fastText
+        predicts the remaining texts in a single list call.
+        :param texts: Texts to identify
+        :param workers: Processes for the langdetect fallback when fastText is unavailable
+        :return: (language code, confidence) for every text
+        """
+        results = [("unknown", 0.0)] * len(texts)
+
+        # 1. Cache lookups; texts missing from the cache are grouped by hash
+        pending = {}
+        repeats = 0
+        for i, text in enumerate(texts):
+            if not text.strip():
+                continue
+            key = hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest()
+            if key in pending:
+                # Repeat of a pending text: reuses its detection, so it counts as a cache hit
+                pending[key].append(i)
+                repeats += 1
+                continue
+            cached = self.language_cache.get(key)
+            if cached is not None:
+                results[i] = cached
             else:
-                # Fallback to langdetect
-                lang = detect(text)
-                return (lang, 0.8)  # Assume lower confidence
-        except (LangDetectException, IndexError):
-            return ("unknown", 0.0)
+                pending[key] = [i]
+        self.language_cache.record_hits(repeats)
+        if not pending:
+            return results
+
+        # 2. Detect every distinct uncached text once (consulting the persistent cache first)
+        keys = list(pending)
+        unique_texts = [texts[pending[key][0]] for key in keys]
+        ft_model = models.get("fasttext_lid")
+        namespace = "langid:fasttext-lid.176" if ft_model else "langid:langdetect"
+        detected = self._cached_inference(namespace, unique_texts,
+                                          lambda batch: self._identify_languages(batch, ft_model, workers))
+
+        # 3. Fill in the results and the cache
+        for key, result in zip(keys, map(tuple, detected)):
+            self.language_cache.put(key, result)
+            for i in pending[key]:
+                results[i] = result
+        return results
+
+    @staticmethod
+    def _identify_languages(texts: List[str], ft_model, workers: int) -> List[Tuple[str, float]]:
+        """Language ID inference for detect_languages"""
+        if ft_model:
+            # fastText rejects newlines, so they are replaced before prediction
+            labels, probabilities = ft_model.predict([text.replace("\n", " ") for text in texts], k=1)
+            return [(label[0].replace("__label__", ""), float(prob[0])) if len(label) else ("unknown", 0.0)
+                    for label, prob in zip(labels, probabilities)]
+        models.get("langdetect")
+        if workers > 1 and len(texts) > workers:
+            # Fallback to langdetect (pure Python, so parallelised across processes)
+            chunksize = max(1, len(texts) // (workers * 4))
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                return list(executor.map(_langdetect, texts, chunksize=chunksize))
+        return [_langdetect(text) for text in texts]
 
-    def split_long_text(self, text: str, lang: str = "en", max_tokens: int = 512) -> List[str]:
+    def _cached_inference(self, namespace: str, texts: List[str], infer: Callable[[List[str]], list]) -> list:
+        """
+        Run infer only on texts missing from the persistent score cache
+        :param namespace: Task plus model name and version
+        :param texts: Input texts
+        :param infer: Batch inference returning one JSON-serializable value per text
+        :return: Value for every text (cached values come back as lists instead of tuples)
+        """
+        if self.score_cache is None or not texts:
+            return infer(texts)
+        values = self.score_cache.get_many(namespace, texts)
+        missing = [i for i, value in enumerate(values) if value is None]
+        if missing:
+            missing_texts = [texts[i] for i in missing]
+            computed = infer(missing_texts)
+            self.score_cache.put_many(namespace, missing_texts, computed)
+            for i, value in zip(missing, computed):
+                values[i] = value
+        return values
+
+    def split_long_text(self, text: str, lang: str = "en", max_tokens: int = 512,
+                        token_counter: Callable[[List[str]], List[int]] = None) -> List[str]:
         """
         Split long text into semantic chunks (avoid splitting sentences)
         """
-        nlp = nlp_en if lang == "en" else nlp_zh if lang == "zh" else None
-        if not nlp or not text.strip():
-            return [text]
-        
-        doc = nlp(text)
-        sentences = [sent.text for sent in doc.sents]
+        return self.split_long_texts([text], lang, max_tokens, token_counter=token_counter)[0]
+
+    def split_long_texts(self, texts: List[str], lang: str = "en", max_tokens: int = 512,
+                         token_counter: Callable[[List[str]], List[int]] = None,
+                         batch_size: int = 256) -> List[List[str]]:
+        """
+        Split many texts into chunks of at most max_tokens tokens without splitting sentences
+        Documents are streamed through nlp.pipe on a tokenizer + sentencizer pipeline (no tagger,
+        parser or NER), and each document's sentences are counted in one batch.
+        :param texts: Texts in the same language
+        :param lang: Language code ('en' or 'zh')
+        :param max_tokens: Token budget per chunk
+        :param token_counter: Optional callable mapping a list of sentences to token counts, e.g.
+                              make_token_counter(tokenizer) for the target model's tokenizer;
+                              defaults to the spaCy token count of each sentence
+        :param batch_size: Documents per nlp.pipe batch
+        :return: List of chunks for every input text
+        """
+        chunker = models.get(f"spacy_{lang}_chunker") if lang in ("en", "zh") else None
+        results = [[text] for text in texts]
+        if not chunker:
+            return results
+
+        # 1. Segment all non-empty documents in batches
+        positions = [i for i, text in enumerate(texts) if text.strip()]
+        docs = chunker.pipe((texts[i] for i in positions), batch_size=batch_size)
+        for i, doc in zip(positions, docs):
+            sentences = [sent.text for sent in doc.sents]
+            # 2. Count tokens for all sentences of the document at once
+            if token_counter is None:
+                counts = [len(sent) for sent in doc.sents]
+            else:
+                counts = token_counter(sentences)
+            # 3. Pack sentences into chunks under the token budget
+            results[i] = self._pack_sentences(sentences, counts, max_tokens)
+        return results
+
+    @staticmethod
+    def _pack_sentences(sentences: List[str], counts: List[int], max_tokens: int) -> List[str]:
+        """Greedily pack sentences into chunks whose token counts stay within max_tokens"""
         chunks = []
         current_chunk = []
         current_length = 0
 
-        for sent in sentences:
-            sent_tokens = len(nlp(sent))
+        for sent, sent_tokens in zip(sentences, counts):
             if current_length + sent_tokens <= max_tokens:
                 current_chunk.append(sent)
                 current_length += sent_tokens
@@ -113,114 +532,546 @@ class AdvancedLLMCleaner:
         
         return chunks
 
-    def filter_semantic_quality(self, texts: List[str], threshold: float = 0.7) -> List[str]:
+    def filter_semantic_quality(self, texts: List[str], threshold: float = 0.7, backend: str = "torch",
+                                max_batch_tokens: int = 8192, max_length: int = None) -> List[str]:
         """
         Filter texts based on semantic quality (using pre-trained classifier)
+        Texts are sorted by token length and grouped into batches whose padded size stays within
+        max_batch_tokens, so short texts are not padded to the longest text of a fixed slice.
+        :param texts: Texts to score
+        :param threshold: Minimum high-quality score
+        :param backend: 'torch', 'int8' or 'onnx' (see QUALITY_BACKENDS)
+        :param max_batch_tokens: Token budget per batch (batch size x longest sequence)
+        :param max_length: Truncation length (defaults to the model maximum, at most 512)
+        :return: High-quality texts in input order
+        """
+        keep = self._semantic_quality_mask(texts, threshold, backend, max_batch_tokens, max_length)
+        return [text for text, kept in zip(texts, keep) if kept]
+
+    def _semantic_quality_mask(self, texts: List[str], threshold: float = 0.7, backend: str = "torch",
+                               max_batch_tokens: int = 8192, max_length: int = None) -> List[bool]:
+        """Classifier decision for every text (see filter_semantic_quality)"""
+        if backend not in QUALITY_BACKENDS:
+            raise ValueError(f"Unknown backend '{backend}', expected one of {sorted(QUALITY_BACKENDS)}")
+        if not texts:
+            return []
+        quality_pipeline = models.get(QUALITY_BACKENDS[backend])
+        max_length = max_length or min(quality_pipeline.tokenizer.model_max_length, 512)
+        namespace = f"quality:{quality_model_name}@{QUALITY_MODEL_VERSION}:{backend}:{max_length}"
+        scores = self._cached_inference(namespace, texts, lambda batch: self._classify_quality(
+            batch, quality_pipeline, max_batch_tokens, max_length))
+        return [label == "LABEL_1" and score >= threshold for label, score in scores]
+
+    @staticmethod
+    def _classify_quality(texts: List[str], quality_pipeline, max_batch_tokens: int,
+                          max_length: int) -> List[Tuple[str, float]]:
+        """Classifier (label, score) for every text, computed in length-bucketed batches"""
+        if not texts:
+            return []
+        # 1. Token lengths (fast tokenizer, one batched call) and length-sorted order
+        lengths = [len(ids) for ids in quality_pipeline.tokenizer(
+            texts, truncation=True, max_length=max_length)["input_ids"]]
+        order = sorted(range(len(texts)), key=lengths.__getitem__)
+
+        # 2. Dynamic batches under the token budget; the last item of a sorted batch is its longest
+        scores = [None] * len(texts)
+        batch = []
+        for position, index in enumerate(order):
+            batch.append(index)
+            next_length = lengths[order[position + 1]] if position + 1 < len(order) else None
+            if next_length is None or (len(batch) + 1) * next_length > max_batch_tokens:
+                results = quality_pipeline([texts[i] for i in batch], batch_size=len(batch),
+                                           truncation=True, max_length=max_length)
+                # 3. Map the results back to input positions
+                for i, res in zip(batch, results):
+                    scores[i] = (res["label"], float(res["score"]))
+                batch = []
+        return scores
+
+    def quality_features(self, texts: List[str]) -> List[Dict[str, Any]]:
+        """
+        Cheap heuristic quality features used by the cascade
+        :param texts: Texts to score
+        :return: Per text: words, symbol_ratio, repetition, stopword_density, lang, language_confidence
+        """
+        features = []
+        for text, (lang, confidence) in zip(texts, self.detect_languages(texts)):
+            words = CASCADE_WORD_PATTERN.findall(text.lower())
+            visible = len(text) - sum(1 for ch in text if ch.isspace())
+            symbols = sum(1 for ch in text if not ch.isalnum() and not ch.isspace())
+            # Repetition: fraction of word trigrams that occur more than once in the text
+            trigrams = list(zip(words, words[1:], words[2:]))
+            features.append({
+                "words": len(words),
+                "symbol_ratio": symbols / visible if visible else 1.0,
+                "repetition": 1 - len(set(trigrams)) / len(trigrams) if trigrams else 0.0,
+                "stopword_density": sum(1 for word in words if word in CASCADE_STOPWORDS) / len(words) if words else 0.0,
+                "lang": lang,
+                "language_confidence": confidence,
+            })
+        return features
+
+    @staticmethod
+    def _cascade_decision(features: Dict[str, Any], config: Dict[str, float]) -> str:
+        """'reject', 'accept' or 'model' for one text"""
+        # Other languages have no stop word list, so their density says nothing ('zh-cn' counts as 'zh')
+        has_stopwords = features["lang"].split("-")[0] in CASCADE_STOPWORD_LANGUAGES
+        if (features["words"] < config["min_words"]
+                or features["symbol_ratio"] > config["max_symbol_ratio"]
+                or features["repetition"] > config["max_repetition"]
+                or (has_stopwords and features["stopword_density"] < config["min_stopword_density"])
+                or features["language_confidence"] < config["min_language_confidence"]):
+            return "reject"
+        if (features["words"] >= config["accept_min_words"]
+                and features["stopword_density"] >= config["accept_min_stopword_density"]
+                and features["symbol_ratio"] <= config["accept_max_symbol_ratio"]
+                and features["repetition"] <= config["accept_max_repetition"]
+                and features["language_confidence"] >= config["accept_min_language_confidence"]):
+            return "accept"
+        return "model"
+
+    def filter_quality_cascade(self, texts: List[str], threshold: float = 0.7, backend: str = "torch",
+                               config: Dict[str, float] = None, audit_rate: float = 0.0,
+                               seed: int = 0) -> Tuple[List[str], dict]:
+        """
+        Cheap-to-expensive quality filtering
+        Heuristic features accept or reject the clear cases; only the ambiguous middle band is
+        sent to the transformer classifier (filter_semantic_quality).
+        :param texts: Texts to filter
+        :param threshold: Classifier threshold for the middle band
+        :param backend: Classifier backend (see QUALITY_BACKENDS)
+        :param config: Overrides for DEFAULT_CASCADE_CONFIG
+        :param audit_rate: Fraction of heuristically decided texts also scored by the model
+                           (held-out sample to measure agreement; their decision is unchanged)
+        :param seed: Random seed for the audit sample
+        :return: Tuple of (high-quality texts in input order, statistics)
         """
-        high_quality = []
-        # Batch processing to improve efficiency
-        for i in range(0, len(texts), 32):
-            batch = texts[i:i+32]
-            results = quality_pipeline(batch)
-            for text, res in zip(batch, results):
-                if res["label"] == "LABEL_1" and res["score"] >= threshold:
-                    high_quality.append(text)
-        return high_quality
+        config = {**DEFAULT_CASCADE_CONFIG, **(config or {})}
+        # 1. Heuristic decisions
+        decisions = [self._cascade_decision(features, config) for features in self.quality_features(texts)]
+        to_model = [i for i, decision in enumerate(decisions) if decision == "model"]
+        decided = [i for i, decision in enumerate(decisions) if decision != "model"]
+        rng = random.Random(seed)
+        audited = [i for i in decided if rng.random() < audit_rate]
+
+        # 2. Classifier on the middle band and the audit sample (one batched call)
+        scored = to_model + audited
+        model_keep = dict(zip(scored, self._semantic_quality_mask([texts[i] for i in scored], threshold, backend)))
+
+        keep = [decision == "accept" or (decision == "model" and model_keep[i])
+                for i, decision in enumerate(decisions)]
+        agreements = sum(model_keep[i] == (decisions[i] == "accept") for i in audited)
+        stats = {
+            "total": len(texts),
+            "heuristic_rejected": decisions.count("reject"),
+            "heuristic_accepted": decisions.count("accept"),
+            "model_calls": len(scored),
+            "model_calls_avoided": len(decided) - len(audited),
+            "audited": len(audited),
+            "audit_agreement": agreements / len(audited) if audited else None,
+            "kept": sum(keep),
+        }
+        return [text for text, kept in zip(texts, keep) if kept], stats
 
     def desensitize_text(self, text: str, lang: str = "en") -> str:
         """
         Deep desensitization: replace sensitive info with placeholders
         """
-        # 1. Pattern-based replacement
-        for name, pattern in self.sensitive_patterns.items():
-            text = re.sub(pattern, f"[{name}_REDACTED]", text)
-        
-        # 2. NER-based replacement (names, addresses, organizations)
-        nlp = nlp_en if lang == "en" else nlp_zh if lang == "zh" else None
-        if nlp:
-            doc = nlp(text)
-            for ent in doc.ents:
-                # Redact personal entities (customize based on your needs)
-                if ent.label_ in ["PERSON", "GPE", "ORG", "DATE"]:  # GPE: countries/cities
-                    text = text.replace(ent.text, f"[{ent.label_}_REDACTED]")
-        
-        # 3. Harmful content filtering
-        for keyword in self.harmful_keywords:
-            if keyword in text.lower():
-                return ""  # Remove entirely if harmful content is found
-        return text
+        return self.desensitize_texts([text], lang)[0]
+
+    def desensitize_texts(self, texts: List[str], lang: str = "en", batch_size: int = 256) -> List[str]:
+        """
+        Batch desensitization: redact PII and named entities, drop harmful texts
+        Every text is scanned once by a single combined PII regex, entities come from one nlp.pipe
+        pass over the batch, and each output string is rebuilt once from the collected spans.
+        :param texts: Texts in the same language
+        :param lang: Language code ('en' or 'zh')
+        :param batch_size: Documents per nlp.pipe batch
+        :return: Desensitized texts ("" for texts containing harmful keywords)
+        """
+        results = [""] * len(texts)
+
+        # 1. Harmful content screening (these texts are removed entirely, so skip the rest)
+        contains_keyword = self._keyword_screen()
+        keep = [i for i, text in enumerate(texts) if not contains_keyword(text)]
+
+        # 2. Pattern-based spans from one combined alternation
+        pii_pattern, group_labels = self._pii_pattern()
+        spans = {}
+        for i in keep:
+            spans[i] = [(m.start(), m.end(), group_labels[m.lastgroup]) for m in pii_pattern.finditer(texts[i])]
+
+        # 3. NER-based spans (names, addresses, organizations)
+        nlp = _spacy_for(lang)
+        if nlp and keep:
+            namespace = f"ner:{nlp.meta['lang']}_{nlp.meta['name']}-{nlp.meta['version']}"
+            entities = self._cached_inference(namespace, [texts[i] for i in keep],
+                                              lambda batch: self._extract_entities(batch, nlp, batch_size))
+            for i, doc_entities in zip(keep, entities):
+                spans[i].extend((start, end, f"{label}_REDACTED")
+                                for start, end, label in doc_entities if label in self.redacted_entity_labels)
+
+        # 4. Rebuild every text once
+        for i in keep:
+            results[i] = self._apply_redactions(texts[i], spans[i])
+        return results
+
+    @staticmethod
+    def _extract_entities(texts: List[str], nlp, batch_size: int) -> List[List[Tuple[int, int, str]]]:
+        """(start_char, end_char, label) of every entity, from one nlp.pipe pass"""
+        # Only the NER component (and the embeddings it may listen to) is needed
+        disabled = [name for name in nlp.pipe_names if name not in ("tok2vec", "transformer", "ner")]
+        docs = nlp.pipe(texts, batch_size=batch_size, disable=disabled)
+        return [[(ent.start_char, ent.end_char, ent.label_) for ent in doc.ents] for doc in docs]
+
+    def _pii_pattern(self) -> Tuple[re.Pattern, Dict[str, str]]:
+        """Compile sensitive_patterns into one alternation with a named group per pattern (cached)"""
+        key = tuple(self.sensitive_patterns.items())
+        cached_key, pattern, group_labels = self._pii_matcher
+        if cached_key != key:
+            group_labels = {f"pii{i}": f"{name}_REDACTED" for i, (name, _) in enumerate(key)}
+            pattern = re.compile("|".join(f"(?P<pii{i}>{regex})" for i, (_, regex) in enumerate(key)))
+            self._pii_matcher = (key, pattern, group_labels)
+        return pattern, group_labels
+
+    def _keyword_screen(self) -> Callable[[str], bool]:
+        """
+        Build a predicate telling whether a text contains any harmful keyword (case-insensitive, cached)
+        Uses an Aho-Corasick automaton when pyahocorasick is installed, else one regex alternation.
+        """
+        key = frozenset(keyword.lower() for keyword in self.harmful_keywords)
+        cached_key, screen = self._keyword_matcher
+        if cached_key == key:
+            return screen
+
+        if not key:
+            screen = lambda text: False
+        elif ahocorasick is not None:
+            automaton = ahocorasick.Automaton()
+            for keyword in key:
+                automaton.add_word(keyword, keyword)
+            automaton.make_automaton()
+            screen = lambda text: next(automaton.iter(text.lower()), None) is not None
+        else:
+            # Longest keywords first so the alternation behaves like a multi-pattern search
+            pattern = re.compile("|".join(re.escape(k) for k in sorted(key, key=len, reverse=True)))
+            screen = lambda text: pattern.search(text.lower()) is not None
+        self._keyword_matcher = (key, screen)
+        return screen
+
+    @staticmethod
+    def _apply_redactions(text: str, spans: List[Tuple[int, int, str]]) -> str:
+        """
+        Replace character spans with [LABEL] placeholders in a single pass
+        Overlapping spans keep the one starting first (the longest one on ties).
+        """
+        if not spans:
+            return text
+        spans.sort(key=lambda span: (span[0], -span[1]))
+        parts = []
+        position = 0
+        for start, end, label in spans:
+            if start < position:
+                continue  # overlaps a span that is already redacted
+            parts.append(text[position:start])
+            parts.append(f"[{label}]")
+            position = end
+        parts.append(text[position:])
+        return "".join(parts)
 
     def remove_cross_lang_noise(self, text: str, primary_lang: str = None) -> str:
         """
         Remove mixed-language noise (e.g., English words in Chinese text with low info value)
         """
-        if not primary_lang:
-            primary_lang, _ = self.detect_language_advanced(text)
-            if primary_lang == "unknown":
-                return text
-        
-        # For Chinese text: remove English words with low semantic value
-        if primary_lang == "zh":
-            # Keep meaningful English terms (e.g., "AI", "GDP") but remove noise
-            english_words = re.findall(r'[A-Za-z]+', text)
-            for word in english_words:
-                if len(word) < 3 and word.lower() not in {"ai", "it", "gdp"}:
-                    text = text.replace(word, "")
-        return text
+        return self.remove_cross_lang_noise_texts([text], primary_lang)[0]
 
-    def distributed_clean(self, file_paths: List[str], batch_size: int = 1000) -> None:
+    def remove_cross_lang_noise_texts(self, texts: List[str], primary_lang: str = None) -> List[str]:
         """
-        Distributed cleaning for large-scale data using Dask
+        Batch cross-language noise removal
+        In Chinese texts, English words shorter than three letters that are not in
+        cross_lang_allowlist are removed. Words are maximal runs of ASCII letters, so letters
+        inside longer words are never touched, and every text is rewritten in one regex pass.
+        :param texts: Texts to clean
+        :param primary_lang: Language code of all texts (detected per text in one batch if None)
+        :return: Cleaned texts (unchanged for non-Chinese or undetected texts)
+        """
+        if primary_lang:
+            languages = [primary_lang] * len(texts)
+        else:
+            languages = [lang for lang, _ in self.detect_languages(texts)]
+
+        allowlist = {word.lower() for word in self.cross_lang_allowlist}
+        # Keep meaningful English terms (e.g., "AI", "GDP") but remove noise
+        drop_noise = lambda match: match.group() if match.group().lower() in allowlist else ""
+        # fastText reports 'zh', langdetect 'zh-cn' / 'zh-tw'
+        return [CROSS_LANG_NOISE_PATTERN.sub(drop_noise, text) if lang.split("-")[0] == "zh" else text
+                for text, lang in zip(texts, languages)]
+
+    def iter_clean_block(self, block, batch_size: int = 1000, text_field: str = "text",
+                         metrics: StageMetrics = None) -> Iterator[List[dict]]:
+        """
+        Stream one input block through the per-line pipeline, batch_size lines at a time
+        :param block: (path, start, end) from text_blocks.plan_blocks
+        :param batch_size: Lines processed together
+        :param text_field: Text field of JSONL records
+        :param metrics: Optional StageMetrics
+        :return: Iterator of record batches; every record has text, lang, conf, source (input path),
+                 offset (byte offset of the input line) and chunk (index within the input line)
         """
-        # Create Dask bag from file paths
-        bag = db.from_sequence(file_paths, npartitions=8)
+        metrics = metrics or NULL_METRICS
+        records = iter_block_records(block, text_field)
+        while True:
+            with metrics.stage('read_block') as record:
+                batch = [(offset, text.strip()) for offset, text in itertools.islice(records, batch_size)]
+                record.set_output([text for _, text in batch])
+            if not batch:
+                break
+            yield self._clean_lines(batch, block[0], metrics)
+
+    def _clean_lines(self, lines: List[Tuple[int, str]], source: str, metrics: StageMetrics) -> List[dict]:
+        """Per-line stages of distributed_clean for one batch of (offset, line) pairs"""
+        # Basic cleaning
+        with metrics.stage('normalize_whitespace', [text for _, text in lines]) as record:
+            lines = [(offset, text) for offset, text in
+                     ((offset, re.sub(r'\s+', ' ', text).strip()) for offset, text in lines) if len(text) >= 20]
+            record.set_output([text for _, text in lines])
+        
+        # Language detection (one batched, cached call per batch)
+        with metrics.stage('detect_language', [text for _, text in lines]) as record:
+            languages = self.detect_languages([text for _, text in lines])
+            detected = [(offset, text, lang, conf) for (offset, text), (lang, conf) in zip(lines, languages)
+                        if conf >= 0.6]
+            record.set_output(len(detected))
         
-        # Define processing pipeline
-        def process_file(file_path):
-            with open(file_path, "r", encoding="utf-8", errors="ignore") as f:
-                texts = [line.strip() for line in f if line.strip()]
+        # Group by language so that each stage runs once per language (one nlp.pipe pass each)
+        groups = {}
+        for i, (_, _, lang, _) in enumerate(detected):
+            groups.setdefault(lang, []).append(i)
+        chunk_lists = [[] for _ in detected]
+        for lang, positions in groups.items():
+            texts = [detected[i][1] for i in positions]
             
-            cleaned = []
-            for text in texts:
-                # Basic cleaning
-                text = re.sub(r'\s+', ' ', text).strip()
-                if len(text) < 20:
-                    continue
-                
-                # Language detection
-                lang, conf = self.detect_language_advanced(text)
-                if conf < 0.6:
-                    continue
-                
-                # Desensitize
-                text = self.desensitize_text(text, lang)
-                if not text:
-                    continue
-                
-                # Cross-language noise removal
-                text = self.remove_cross_lang_noise(text, lang)
-                
-                # Split long text
-                chunks = self.split_long_text(text, lang)
-                cleaned.extend(chunks)
+            # Desensitize
+            with metrics.stage('desensitize', texts) as record:
+                texts = self.desensitize_texts(texts, lang)
+                kept = [(i, text) for i, text in zip(positions, texts) if text]
+                positions = [i for i, _ in kept]
+                texts = [text for _, text in kept]
+                record.set_output(texts)
+            if not texts:
+                continue
             
-            return cleaned
+            # Cross-language noise removal
+            with metrics.stage('remove_cross_lang_noise', texts) as record:
+                texts = self.remove_cross_lang_noise_texts(texts, lang)
+                record.set_output(texts)
+            
+            # Split long text
+            with metrics.stage('split_long_text', texts) as record:
+                chunks = self.split_long_texts(texts, lang)
+                record.set_output([chunk for text_chunks in chunks for chunk in text_chunks])
+            for i, text_chunks in zip(positions, chunks):
+                chunk_lists[i] = text_chunks
+        
+        # Records in input order
+        cleaned = []
+        for (offset, _, lang, conf), chunks in zip(detected, chunk_lists):
+            cleaned.extend({"text": chunk, "lang": lang, "conf": float(conf), "source": source,
+                            "offset": offset, "chunk": index} for index, chunk in enumerate(chunks))
+        
+        return cleaned
+
+    def distributed_clean(self, file_paths: List[str], batch_size: int = 1000, metrics: StageMetrics = None,
+                          block_size: int = DEFAULT_BLOCK_SIZE, text_field: str = "text",
+                          scheduler: str = "processes", workers: int = None,
+                          output_dir: str = "cleaned_data", resume: bool = False, verify: bool = False,
+                          output_format: str = "text", shard_size: int = DEFAULT_SHARD_SIZE) -> None:
+        """
+        Distributed cleaning for large-scale data using Dask
+        Inputs are split into line-aligned byte-range blocks (one per compressed .gz/.zst file),
+        and every block streams through the pipeline batch_size lines at a time, so large files
+        are spread over all workers and worker memory stays bounded.
+        Each worker receives this cleaner once and loads the models of MODEL_REQUIREMENTS
+        ['distributed_clean'] (plus required_models) once at start-up; tasks only ship block ranges.
+        Every block is written atomically to its own part shards and then recorded in the run
+        manifest (output_dir/_manifest.jsonl) with its record count and checksum; with resume=True
+        blocks whose manifest entry is still valid are skipped, so a re-run after a crash only
+        processes the unfinished blocks.
+        Pass a StageMetrics instance to collect per-stage timings; workers measure their own
+        stages and the results are merged into metrics (and its callback) on the driver.
+        :param file_paths: Plain-text or JSONL files, optionally gzip/zstd compressed
+        :param batch_size: Lines processed together within a block
+        :param metrics: Optional StageMetrics
+        :param block_size: Target bytes per block for uncompressed files
+        :param text_field: Text field of JSONL records
+        :param scheduler: 'threads' (one process, models shared; GIL-bound stages do not scale),
+                          'processes' (a spawned process pool) or 'distributed' (a local
+                          dask.distributed cluster with one single-threaded worker process per core)
+        :param workers: Number of worker threads/processes (default: number of CPUs)
+        :param output_dir: Directory receiving part-<block id>-<shard> files and the manifest
+        :param resume: Skip blocks completed by a previous run (otherwise previous outputs are removed)
+        :param verify: When resuming, re-hash existing outputs instead of only checking their size
+        :param output_format: Key of shard_io.WRITERS: 'text' (bare lines), 'jsonl.zst', 'parquet' or
+                              'arrow'; the structured formats keep the per-record metadata
+        :param shard_size: Target uncompressed text bytes per output shard
+        """
+        import dask.bag as db
+        from dask.diagnostics import ProgressBar
+
+        if scheduler not in SCHEDULERS:
+            raise ValueError(f"Unknown scheduler '{scheduler}', expected one of {SCHEDULERS}")
+        if output_format not in WRITERS:
+            raise ValueError(f"Unknown output format '{output_format}', expected one of {sorted(WRITERS)}")
+        # Fail before scheduling any task if the format's optional package is missing
+        WRITERS[output_format].check_dependencies()
+        workers = workers or os.cpu_count() or 1
+        metrics = metrics or NULL_METRICS
+        instrument = metrics.enabled  # only a flag is shipped to the workers, not the hook
         
-        # Execute in parallel
-        cleaned_bag = bag.map(process_file).flatten()
+        # Plan blocks and skip the ones a previous run already completed
+        os.makedirs(output_dir, exist_ok=True)
+        manifest = RunManifest(output_dir)
+        if resume:
+            done = manifest.recover(verify)
+        else:
+            manifest.reset()
+            done = set()
+        all_blocks = plan_blocks(file_paths, block_size)
+        blocks = [block for block in all_blocks if block_id(block) not in done]
+        if resume:
+            print(f"Resuming: {len(all_blocks) - len(blocks)} of {len(all_blocks)} blocks already completed.")
+        if not blocks:
+            print("Distributed cleaning completed.")
+            return
         
-        # Save results (example: write to output directory)
-        with ProgressBar():
-            cleaned_bag.to_textfiles("cleaned_data/output_*.txt")
+        # Create Dask bag with one partition per block
+        bag = db.from_sequence(blocks, npartitions=len(blocks))
+        
+        # Execute in parallel; every task writes its part file and manifest entry itself,
+        # so work finished before a crash is kept
+        tasks = _task_module()
+        results = bag.map(tasks._clean_block, batch_size, text_field, instrument, output_dir, output_format,
+                          shard_size)
+        if scheduler == "threads":
+            tasks._init_worker(self)
+            with ProgressBar():
+                reports = results.compute(scheduler="threads", num_workers=workers)
+        elif scheduler == "processes":
+            # Spawned (not forked) workers: each one unpickles the cleaner and loads the models once
+            context = multiprocessing.get_context("spawn")
+            with ProcessPoolExecutor(max_workers=workers, mp_context=context,
+                                     initializer=tasks._init_worker, initargs=(self,)) as pool:
+                with ProgressBar():
+                    reports = results.compute(scheduler="processes", pool=pool)
+        else:
+            from dask.distributed import Client, LocalCluster
+            with LocalCluster(n_workers=workers, threads_per_worker=1, processes=True) as cluster, \
+                    Client(cluster) as client:
+                # A worker plugin (unlike client.run) also initialises workers started later,
+                # e.g. when the nanny restarts one after running out of memory
+                client.register_plugin(tasks._cleaner_worker_plugin(self))
+                reports = results.compute(scheduler=client)
+        for report in reports:
+            metrics.merge(report)
         
         print("Distributed cleaning completed.")
 
 
+# Cleaner of the current worker process (set once by _init_worker)
+_worker_cleaner = None
+
+
+def _task_module():
+    """
+    Module whose _init_worker/_clean_block distributed_clean ships to the workers
+    When this file runs as a script, functions of __main__ are pickled by value together with
+    the driver's _worker_cleaner (None), so a task would never see what _init_worker set in its
+    worker; the importable module is pickled by reference and shares that global instead.
+    """
+    if __name__ != "__main__":
+        return sys.modules[__name__]
+    return importlib.import_module(os.path.splitext(os.path.basename(__file__))[0])
+
+
+def _init_worker(cleaner: "AdvancedLLMCleaner") -> None:
+    """Worker start-up for distributed_clean: keep the cleaner and load its models once"""
+    global _worker_cleaner
+    _worker_cleaner = cleaner
+    cleaner.preload_models(cleaner.required_models + cleaner.MODEL_REQUIREMENTS["distributed_clean"])
+
+
+def _cleaner_worker_plugin(cleaner: "AdvancedLLMCleaner"):
+    """Dask WorkerPlugin running _init_worker on every worker that joins the cluster"""
+    from distributed import WorkerPlugin
+
+    class CleanerWorkerPlugin(WorkerPlugin):
+        name = "llm-data-cleaner"
+
+        def __init__(self, cleaner):
+            self.cleaner = cleaner
+
+        def setup(self, worker):
+            _init_worker(self.cleaner)
+
+    return CleanerWorkerPlugin(cleaner)
+
+
+def _clean_block(block, batch_size: int, text_field: str, instrument: bool, output_dir: str,
+                 output_format: str, shard_size: int) -> dict:
+    """
+    Dask task of distributed_clean, executed in a worker
+    Cleans one block, streams its records into atomically written shards and records them
+    in the run manifest.
+    :return: Per-stage metrics report
+    """
+    if _worker_cleaner is None:
+        raise RuntimeError("distributed_clean worker was not initialised: _init_worker must run in every "
+                           "worker process before its first task")
+    block_metrics = StageMetrics() if instrument else NULL_METRICS
+    bid = block_id(block)
+    # Shards of an earlier, unrecorded attempt at this block may differ in number; drop them
+    for name in os.listdir(output_dir):
+        if name.startswith(f"{OUTPUT_PREFIX}{bid}-"):
+            os.remove(os.path.join(output_dir, name))
+    writer = WRITERS[output_format](os.path.join(output_dir, f"{OUTPUT_PREFIX}{bid}"), shard_size)
+    try:
+        for records in _worker_cleaner.iter_clean_block(block, batch_size, text_field, block_metrics):
+            with block_metrics.stage('write_output', len(records)) as record:
+                writer.write(records)
+                record.set_output(len(records))
+        outputs = writer.close()
+    except BaseException:
+        writer.abort()
+        raise
+    path, start, end = block
+    RunManifest(output_dir).record({
+        "block_id": bid,
+        "input": path,
+        "start": start,
+        "end": end,
+        "input_fingerprint": input_fingerprint(path),
+        "format": output_format,
+        "outputs": outputs,
+    })
+    return block_metrics.report()
+
+
+def _langdetect(text: str) -> Tuple[str, float]:
+    """langdetect fallback for detect_languages (module level so it can run in worker processes)"""
+    try:
+        return (detect(text), 0.8)  # Assume lower confidence
+    except LangDetectException:
+        return ("unknown", 0.0)
+
+
 # ----------------------
 # Usage Example
 # ----------------------
 if __name__ == "__main__":
     cleaner = AdvancedLLMCleaner()
+    # To reuse language ID, quality and NER outputs across runs over overlapping crawls:
+    # cleaner = AdvancedLLMCleaner(score_cache=ScoreCache("model_scores.db"))
+    # ... and inspect cleaner.score_cache.report() for hit rates
     
     # Example 1: Process a single long text
     long_text = """
@@ -244,8 +1095,11 @@ if __name__ == "__main__":
     ]
     high_quality = cleaner.filter_semantic_quality(sample_texts)
     print("\nHigh quality texts after filtering:", high_quality)
+    # Heuristics decide the obvious cases; only ambiguous texts reach the classifier
+    high_quality, cascade_stats = cleaner.filter_quality_cascade(sample_texts)
+    print("Cascade statistics:", cascade_stats)
     
     # Example 3: Distributed cleaning (uncomment to test with your files)
     # file_paths = [f"data/raw_{i}.txt" for i in range(10)]  # Replace with your file paths
-    # cleaner.distributed_clean(file_paths)
+    # cleaner.distributed_clean(file_paths, scheduler="processes", workers=8)
     
\ No newline at end of file
@@ -1,25 +1,144 @@
 import re
+import json
 import string
 import pandas as pd
 import numpy as np
-from typing import List, Tuple
+from typing import List, Tuple, Dict, Iterable, Iterator
 import nltk
 from nltk.corpus import stopwords
 from nltk.tokenize import word_tokenize
+from text_dedup import MinHashLSH, FingerprintIndex
+from pipeline_metrics import StageMetrics, NULL_METRICS
+from text_pipeline import StageRegistry
 from sklearn.feature_extraction.text import TfidfVectorizer
+import os
+import shutil
 import hashlib
+import tempfile
+from itertools import repeat
+from concurrent.futures import ProcessPoolExecutor
 
-# 下载NLTK资源（首次次运行需要）
-nltk.download('stopwords')
-nltk.download('punkt')
+# 快速去停用词使用的分词正则：单词（允许内部撇号/连字符）或单个符号
+TOKEN_PATTERN = re.compile(r"\w+(?:['-]\w+)*|[^\w\s]")
 
-class LLMDataCleaner:
+# process_pipeline的默认阶段顺序：先执行低成本的过滤，只对保留下来的文本执行转换
+DEFAULT_PIPELINE = [
+    'dedup',
+    {'stage': 'length_filter', 'min_length': 10},
+    'clean',
+    'case_normalize',
+    {'stage': 'quality_filter', 'quality_threshold': 0.3},
+]
+
+# LLMDataCleaner.score_texts返回的评分矩阵各列含义
+SCORE_COLUMNS = ('length', 'stripped_length', 'non_punct_ratio', 'punct_ratio',
+                 'digit_ratio', 'upper_ratio', 'whitespace_ratio')
+# 统计各类字符数量时用bytes.translate删除的ASCII字节（均为ASCII字符类）
+PUNCTUATION_BYTES = string.punctuation.encode('ascii')
+DIGIT_BYTES = string.digits.encode('ascii')
+UPPERCASE_BYTES = string.ascii_uppercase.encode('ascii')
+WHITESPACE_BYTES = string.whitespace.encode('ascii')
+
+
+def _encode_texts(texts: List[str]) -> List[bytes]:
+    """
+    将文本编码为UTF-8，供_count_ascii_class使用（孤立代理字符原样保留，不会报错）
+    :param texts: 文本列表
+    :return: 编码后的字节串列表
+    """
+    return [text.encode('utf-8', 'surrogatepass') for text in texts]
+
+
+def _count_ascii_class(encoded: List[bytes], delete: bytes) -> np.ndarray:
+    """
+    统计每条文本中某一ASCII字符类的字符数量
+    UTF-8中ASCII字节只会表示ASCII字符，因此字符数等于bytes.translate删除的字节数；
+    删除过程完全在C层执行，没有str.translate逐字符查字典的开销
+    :param encoded: _encode_texts返回的字节串列表
+    :param delete: 该字符类的ASCII字节
+    :return: 每条文本的字符数量
+    """
+    return np.fromiter((len(data) - len(data.translate(None, delete)) for data in encoded),
+                       dtype=np.int64, count=len(encoded))
+
+
+def _ensure_nltk_resource(resource_path: str, package: str) -> None:
+    """
+    仅在本地未安装时下载NLTK资源
+    :param resource_path: nltk.data.find使用的资源路径
+    :param package: 传给nltk.download的包名
+    """
+    try:
+        nltk.data.find(resource_path)
+    except LookupError:
+        nltk.download(package)
+
+
+class _CharWhitelistTable(dict):
+    """
+    惰性填充的str.translate映射表，等价于clean_special_characters中的白名单正则
+    每个码位首次出现时判定一次并缓存，之后的转换完全在C层完成
+    """
+    def __missing__(self, codepoint: int):
+        char = chr(codepoint)
+        # 对str模式而言，\w 等价于 isalnum() 或 '_'，\s 等价于 isspace()
+        if char.isalnum() or char.isspace() or char in "_.,!?'\"-":
+            value = codepoint
+        else:
+            value = None
+        self[codepoint] = value
+        return value
+
+
+class CompiledCharacterCleaner:
+    """
+    LLMDataCleaner.clean_special_characters的预编译融合实现
+    输出完全一致，但扫描次数更少：不包含触发子串时跳过正则，
+    字符白名单过滤只需一次str.translate，空白合并使用split/join
+    """
+    URL_PATTERN = re.compile(r'http\S+|www\S+')  # 'https'已被'http'覆盖
+    HTML_TAG_PATTERN = re.compile(r'<.*?>')
+    
     def __init__(self):
-        """初始化数据清洗工具，加载停用词等资源"""
+        self.whitelist_table = _CharWhitelistTable()
+    
+    def clean(self, text: str) -> str:
+        """
+        清理特殊字符、乱码和多余空格
+        :param text: 原始文本
+        :return: 清理后的文本
+        """
+        # 去除URL
+        if 'http' in text or 'www' in text:
+            text = self.URL_PATTERN.sub('', text)
+        
+        # 去除HTML标签
+        if '<' in text:
+            text = self.HTML_TAG_PATTERN.sub('', text)
+        
+        # 删除白名单之外的字符，再把连续空白合并为一个空格
+        text = text.translate(self.whitelist_table)
+        return ' '.join(text.split())
+
+
+class LLMDataCleaner:
+    def __init__(self, dedup_index: FingerprintIndex = None):
+        """
+        初始化数据清洗工具，加载停用词等资源
+        :param dedup_index: 可选的持久化指纹索引，启用后历史批次中出现过的文本也视为重复
+        """
+        # 首次使用时下载NLTK资源（首次运行需要）
+        _ensure_nltk_resource('corpora/stopwords', 'stopwords')
         self.stop_words = set(stopwords.words('english'))  # 英文停用词
         # 扩展停用词表（可根据需求添加中文停用词）
         self.custom_stop_words = {"http", "https", "www", "com", "html", "jpg", "png"}
         self.stop_words.update(self.custom_stop_words)
+        # 预编译的融合清洗引擎（clean_special_characters的快速版本）
+        self.char_cleaner = CompiledCharacterCleaner()
+        self.dedup_index = dedup_index
+        # process_pipeline可用的命名阶段
+        self.stage_registry = StageRegistry()
+        self._register_default_stages()
         
     def remove_duplicates(self, texts: List[str]) -> Tuple[List[str], int]:
         """
@@ -33,35 +152,94 @@ class LLMDataCleaner:
         duplicates = 0
         
         for text in texts:
-            # 对文本进行哈希处理（忽略大小写和前后空格）
-            text_normalized = text.strip().lower()
-            text_hash = hashlib.md5(text_normalized.encode()).hexdigest()
+            text_hash = self._text_digest(text)
             
-            if text_hash not in seen:
+            if text_hash not in seen and self._is_new_across_runs(text_hash):
                 seen.add(text_hash)
                 unique_texts.append(text)
             else:
                 duplicates += 1
+        
+        if self.dedup_index is not None:
+            self.dedup_index.flush()
                 
         return unique_texts, duplicates
     
-    def filter_short_texts(self, texts: List[str], min_length: int = 10) -> Tuple[List[str], int]:
+    def _is_new_across_runs(self, text_hash: bytes) -> bool:
+        """
+        在持久化索引（如已配置）中检查并记录摘要
+        :param text_hash: _text_digest返回的摘要
+        :return: 若文本在之前的运行中已处理过则返回False
+        """
+        if self.dedup_index is None:
+            return True
+        return self.dedup_index.add(FingerprintIndex.fingerprint(text_hash))
+    
+    def _text_digest(self, text: str) -> bytes:
+        """
+        计算文本的去重摘要
+        :param text: 原始文本
+        :return: 规范化文本的16字节MD5摘要
+        """
+        # 对文本进行哈希处理（忽略大小写和前后空格）
+        text_normalized = text.strip().lower()
+        return hashlib.md5(text_normalized.encode()).digest()
+    
+    def remove_near_duplicates(self, texts: List[str], threshold: float = 0.8, num_perm: int = 128,
+                               shingle_size: int = 5) -> Tuple[List[str], int, Dict[int, List[int]]]:
+        """
+        基于MinHash签名和LSH分桶去除近似重复文本（如仅日期或跟踪参数不同的页面）
+        :param texts: 文本列表
+        :param threshold: Jaccard相似度阈值，达到该值视为重复
+        :param num_perm: MinHash置换次数
+        :param shingle_size: 每个shingle的字符数
+        :return: 去重后的文本列表、去除的近似重复数量、聚类结果（保留文本下标 -> 其重复文本下标列表）
+        """
+        lsh = MinHashLSH(threshold, num_perm, shingle_size)
+        kept, clusters = lsh.deduplicate(texts)
+        return [texts[i] for i in kept], len(texts) - len(kept), clusters
+    
+    def filter_short_texts(self, texts: List[str], min_length: int = 10, scores: np.ndarray = None) -> Tuple[List[str], int]:
         """
         过滤过短文本（通常包含噪声）
         :param texts: 文本列表
         :param min_length: 最小字符长度
+        :param scores: 可选，score_texts返回的评分矩阵（避免再次对每条文本strip）
         :return: 过滤后的文本列表和去除的短文本数量
         """
-        filtered = []
-        removed = 0
+        if scores is None:
+            stripped_lengths = np.fromiter((len(text.strip()) for text in texts), dtype=np.int64, count=len(texts))
+        else:
+            stripped_lengths = scores[:, SCORE_COLUMNS.index('stripped_length')]
         
-        for text in texts:
-            if len(text.strip()) >= min_length:
-                filtered.append(text)
-            else:
-                removed += 1
-                
-        return filtered, removed
+        keep = stripped_lengths >= min_length
+        filtered = [text for text, kept in zip(texts, keep) if kept]
+        return filtered, len(texts) - len(filtered)
+    
+    def score_texts(self, texts: List[str]) -> np.ndarray:
+        """
+        批量计算整批文本的质量信号
+        各类字符数量由_count_ascii_class在UTF-8字节上统计，避免逐字符的Python循环；比例计算为向量化数组运算
+        :param texts: 文本列表
+        :return: 形状为(len(texts), len(SCORE_COLUMNS))的浮点矩阵；空文本的比例为NaN
+        """
+        count = len(texts)
+        lengths = np.fromiter(map(len, texts), dtype=np.int64, count=count)
+        stripped_lengths = np.fromiter((len(text.strip()) for text in texts), dtype=np.int64, count=count)
+        
+        encoded = _encode_texts(texts)
+        punctuation = _count_ascii_class(encoded, PUNCTUATION_BYTES)
+        scores = np.empty((count, len(SCORE_COLUMNS)), dtype=np.float64)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            scores[:, 0] = lengths
+            scores[:, 1] = stripped_lengths
+            # 与_is_high_quality使用相同的表达式，保证相同阈值下结果一致
+            scores[:, 2] = (lengths - punctuation) / lengths
+            scores[:, 3] = punctuation / lengths
+            scores[:, 4] = _count_ascii_class(encoded, DIGIT_BYTES) / lengths
+            scores[:, 5] = _count_ascii_class(encoded, UPPERCASE_BYTES) / lengths
+            scores[:, 6] = _count_ascii_class(encoded, WHITESPACE_BYTES) / lengths
+        return scores
     
     def clean_special_characters(self, text: str) -> str:
         """
@@ -83,20 +261,47 @@ class LLMDataCleaner:
         
         return text
     
-    def remove_stopwords(self, text: str, language: str = 'english') -> str:
+    def clean_special_characters_fast(self, text: str) -> str:
+        """
+        clean_special_characters的快速等价实现（输出完全一致）
+        :param text: 原始文本
+        :return: 清理后的文本
+        """
+        return self.char_cleaner.clean(text)
+    
+    def remove_stopwords(self, text: str, language: str = 'english', backend: str = 'nltk') -> str:
         """
         去除停用词（可选步骤，根据模型需求决定）
         :param text: 原始文本
         :param language: 语言（目前支持英文）
+        :param backend: 'nltk'（Treebank精确分词，较慢）或'regex'（预编译正则分词，较快）
         :return: 去除停用词后的文本
         """
         if language != 'english':
             return text  # 可扩展支持其他语言
+        if backend == 'regex':
+            return self.remove_stopwords_batch([text], language)[0]
         
+        _ensure_nltk_resource('tokenizers/punkt', 'punkt')
         words = word_tokenize(text)
         filtered_words = [word for word in words if word.lower() not in self.stop_words]
         return ' '.join(filtered_words)
     
+    def remove_stopwords_batch(self, texts: List[str], language: str = 'english') -> List[str]:
+        """
+        使用预编译正则分词批量快速去除停用词
+        缩写保持完整（如"don't"），而NLTK会拆分为"do"和"n't"
+        :param texts: 文本列表
+        :param language: 语言（目前支持英文）
+        :return: 去除停用词后的文本列表
+        """
+        if language != 'english':
+            return list(texts)
+        
+        stop_words = self.stop_words  # 直接使用集合本身：每次调用不复制，后续修改也能生效
+        find_tokens = TOKEN_PATTERN.findall
+        return [' '.join([word for word in find_tokens(text) if word.lower() not in stop_words]) for text in texts]
+    
     def normalize_case(self, text: str, case: str = 'lower') -> str:
         """
         规范化大小写（通常转为小写，减少词汇表大小）
@@ -110,32 +315,45 @@ class LLMDataCleaner:
             return text.upper()
         return text
     
-    def filter_low_quality_texts(self, texts: List[str], quality_threshold: float = 0.3) -> Tuple[List[str], int]:
+    def filter_low_quality_texts(self, texts: List[str], quality_threshold: float = 0.3,
+                                 scores: np.ndarray = None) -> Tuple[List[str], int]:
         """
         过滤低质量文本（基于非标点字符比例）
         :param texts: 文本列表
         :param quality_threshold: 非标点字符占比阈值
+        :param scores: 可选，score_texts返回的评分矩阵（未提供时自动计算）
         :return: 过滤后的文本列表和去除的低质量文本数量
         """
-        filtered = []
-        removed = 0
+        if scores is None:
+            # 只需要标点数量，不必计算完整的评分矩阵
+            lengths = np.fromiter(map(len, texts), dtype=np.int64, count=len(texts))
+            punctuation = _count_ascii_class(_encode_texts(texts), PUNCTUATION_BYTES)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                non_punct_ratio = (lengths - punctuation) / lengths
+        else:
+            non_punct_ratio = scores[:, SCORE_COLUMNS.index('non_punct_ratio')]
         
-        for text in texts:
-            if not text:
-                removed += 1
-                continue
-                
-            # 计算非标点字符比例
-            total_chars = len(text)
-            punctuation_chars = sum(1 for c in text if c in string.punctuation)
-            non_punct_ratio = (total_chars - punctuation_chars) / total_chars
-            
-            if non_punct_ratio >= quality_threshold:
-                filtered.append(text)
-            else:
-                removed += 1
-                
-        return filtered, removed
+        # 空文本的比例为NaN，比较结果恒为False
+        keep = non_punct_ratio >= quality_threshold
+        filtered = [text for text, kept in zip(texts, keep) if kept]
+        return filtered, len(texts) - len(filtered)
+    
+    def _is_high_quality(self, text: str, quality_threshold: float) -> bool:
+        """
+        判断单条文本是否满足非标点字符比例阈值
+        :param text: 文本
+        :param quality_threshold: 非标点字符占比阈值
+        :return: 是否保留该文本
+        """
+        if not text:
+            return False
+        
+        # 计算非标点字符比例
+        total_chars = len(text)
+        data = text.encode('utf-8', 'surrogatepass')
+        punctuation_chars = len(data) - len(data.translate(None, PUNCTUATION_BYTES))
+        non_punct_ratio = (total_chars - punctuation_chars) / total_chars
+        return non_punct_ratio >= quality_threshold
     
     def detect_language(self, text: str) -> str:
         """
@@ -152,14 +370,35 @@ class LLMDataCleaner:
         else:
             return 'other'
     
-    def process_batch(self, texts: List[str], min_length: int = 10, quality_threshold: float = 0.3) -> Tuple[List[str], dict]:
+    def _clean_and_normalize(self, text: str) -> str:
+        """
+        单条文本的清洗步骤（process_batch与process_stream共用）
+        :param text: 原始文本
+        :return: 清洗后的文本（英文转为小写）
+        """
+        # 清理特殊字符
+        text_clean = self.clean_special_characters_fast(text)
+        # 规范化大小写（英文）
+        lang = self.detect_language(text_clean)
+        if lang == 'en':
+            text_clean = self.normalize_case(text_clean, 'lower')
+        return text_clean
+    
+    def process_batch(self, texts: List[str], min_length: int = 10, quality_threshold: float = 0.3,
+                      near_dup_threshold: float = None, workers: int = 1,
+                      metrics: StageMetrics = None) -> Tuple[List[str], dict]:
         """
         批量处理文本的完整流程
         :param texts: 原始文本列表
         :param min_length: 最小长度阈值
         :param quality_threshold: 质量阈值
+        :param near_dup_threshold: MinHash近似去重的Jaccard阈值（None表示不启用）
+        :param workers: 逐条处理阶段使用的进程数（去重始终在当前进程完成，结果与串行一致）
+        :param metrics: 可选的StageMetrics，记录各阶段的墙钟/CPU耗时及输入输出条数和字节数；
+                        汇总结果同时写入stats['stages']
         :return: 清洗后的文本列表和处理统计信息
         """
+        metrics = metrics or NULL_METRICS
         stats = {
             'original_count': len(texts),
             'duplicates_removed': 0,
@@ -170,37 +409,224 @@ class LLMDataCleaner:
         }
         
         # 1. 去除重复文本
-        unique_texts, duplicates = self.remove_duplicates(texts)
+        with metrics.stage('remove_duplicates', texts) as record:
+            unique_texts, duplicates = self.remove_duplicates(texts)
+            record.set_output(unique_texts)
         stats['duplicates_removed'] = duplicates
         
+        # 可选：去除近似重复文本
+        if near_dup_threshold is not None:
+            with metrics.stage('remove_near_duplicates', unique_texts) as record:
+                unique_texts, near_duplicates, clusters = self.remove_near_duplicates(unique_texts, near_dup_threshold)
+                record.set_output(unique_texts)
+            stats['near_duplicates_removed'] = near_duplicates
+            stats['near_duplicate_clusters'] = len(clusters)
+        
         # 2. 过滤过短文本
-        filtered_length, short_removed = self.filter_short_texts(unique_texts, min_length)
+        with metrics.stage('filter_short_texts', unique_texts) as record:
+            filtered_length, short_removed = self.filter_short_texts(unique_texts, min_length)
+            record.set_output(filtered_length)
         stats['short_texts_removed'] = short_removed
         
-        # 3. 清理特殊字符和规范化
-        cleaned = []
-        for text in filtered_length:
-            # 清理特殊字符
-            text_clean = self.clean_special_characters(text)
-            # 规范化大小写（英文）
-            lang = self.detect_language(text_clean)
-            if lang == 'en':
-                text_clean = self.normalize_case(text_clean, 'lower')
-            cleaned.append(text_clean)
-        
-        # 4. 过滤低质量文本
-        high_quality, low_quality_removed = self.filter_low_quality_texts(cleaned, quality_threshold)
+        # 3. 清理特殊字符和规范化，4. 过滤低质量文本
+        if workers > 1:
+            with metrics.stage('clean_and_filter_parallel', filtered_length) as record:
+                high_quality, low_quality_removed = self._clean_and_filter_parallel(filtered_length, quality_threshold, workers)
+                record.set_output(high_quality)
+        else:
+            with metrics.stage('clean_and_normalize', filtered_length) as record:
+                cleaned = [self._clean_and_normalize(text) for text in filtered_length]
+                record.set_output(cleaned)
+            with metrics.stage('filter_low_quality_texts', cleaned) as record:
+                high_quality, low_quality_removed = self.filter_low_quality_texts(cleaned, quality_threshold)
+                record.set_output(high_quality)
         stats['low_quality_removed'] = low_quality_removed
         
         # 5. 最终统计
         stats['final_count'] = len(high_quality)
         stats['other_removed'] = stats['original_count'] - stats['final_count'] - sum([
             stats['duplicates_removed'],
+            stats.get('near_duplicates_removed', 0),
             stats['short_texts_removed'],
             stats['low_quality_removed']
         ])
+        if metrics.enabled:
+            stats['stages'] = metrics.report()
         
         return high_quality, stats
+    
+    def _clean_and_filter_parallel(self, texts: List[str], quality_threshold: float, workers: int) -> Tuple[List[str], int]:
+        """
+        在进程池中执行清洗、大小写规范化和质量过滤
+        :param texts: 已去重并完成长度过滤的文本
+        :param quality_threshold: 质量阈值
+        :param workers: 进程数
+        :return: 按输入顺序排列的高质量文本和去除的低质量文本数量
+        """
+        # 每个进程分配多个连续分片以均衡负载；map()保证分片顺序
+        shard_size = max(1, -(-len(texts) // (workers * 4)))
+        shards = [texts[i:i + shard_size] for i in range(0, len(texts), shard_size)]
+        
+        high_quality = []
+        removed = 0
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            for shard_kept, shard_removed in executor.map(_clean_shard, shards, repeat(quality_threshold)):
+                high_quality.extend(shard_kept)
+                removed += shard_removed
+        return high_quality, removed
+    
+    def _register_default_stages(self) -> None:
+        """注册内置的流水线阶段"""
+        registry = self.stage_registry
+        registry.register('dedup', 'batch', lambda: lambda texts: self.remove_duplicates(texts)[0])
+        registry.register('near_dedup', 'batch',
+                          lambda threshold=0.8: lambda texts: self.remove_near_duplicates(texts, threshold)[0])
+        registry.register('length_filter', 'filter',
+                          lambda min_length=10: lambda text: len(text.strip()) >= min_length)
+        registry.register('clean', 'map', lambda: self.clean_special_characters_fast)
+        registry.register('lang_filter', 'filter',
+                          lambda languages=('en', 'zh'): lambda text: self.detect_language(text) in languages)
+        registry.register('case_normalize', 'map',
+                          lambda: lambda text: self.normalize_case(text, 'lower') if self.detect_language(text) == 'en' else text)
+        registry.register('stopwords', 'map', lambda: lambda text: self.remove_stopwords(text, backend='regex'))
+        registry.register('quality_filter', 'filter',
+                          lambda quality_threshold=0.3: lambda text: self._is_high_quality(text, quality_threshold))
+    
+    def register_stage(self, name: str, kind: str, factory) -> None:
+        """
+        注册自定义流水线阶段（如AdvancedLLMCleaner.desensitize_text）
+        示例：cleaner.register_stage('desensitize', 'map', lambda lang='en': lambda t: adv.desensitize_text(t, lang) or None)
+        :param name: 配置中使用的阶段名
+        :param kind: 'filter'（判断函数）、'map'（转换函数，返回None表示丢弃）或'batch'（处理整个列表）
+        :param factory: 接收配置中的阶段参数并返回阶段函数的可调用对象
+        """
+        self.stage_registry.register(name, kind, factory)
+    
+    def process_pipeline(self, texts: List[str], config: List = None, metrics: StageMetrics = None) -> Tuple[List[str], dict]:
+        """
+        执行可配置的清洗流水线
+        相邻的逐条处理阶段会被融合，每条文本在一组过滤/转换阶段中只遍历一次，遇到第一个拒绝它的过滤器即停止。
+        使用DEFAULT_PIPELINE时，输出与相同阈值下的process_batch一致。
+        :param texts: 原始文本列表
+        :param config: 按顺序排列的阶段名或带参数的字典（默认DEFAULT_PIPELINE）
+        :param metrics: 可选的StageMetrics（融合后的阶段组作为一个阶段计时）
+        :return: 清洗后的文本列表和统计信息（含各阶段去除数量）
+        """
+        pipeline = self.stage_registry.build(config or DEFAULT_PIPELINE)
+        return pipeline.run(texts, metrics)
+    
+    def iter_records(self, file_paths: Iterable[str], field: str = 'text') -> Iterator[str]:
+        """
+        逐行惰性读取纯文本文件（每行一条）或JSONL文件中的文本
+        :param file_paths: 输入文件路径（以.jsonl/.ndjson结尾的文件按JSON记录解析）
+        :param field: JSONL记录中文本所在的字段名
+        :return: 原始文本迭代器
+        """
+        for file_path in file_paths:
+            is_jsonl = file_path.endswith(('.jsonl', '.ndjson'))
+            with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
+                for line in f:
+                    if not line.strip():
+                        continue
+                    if not is_jsonl:
+                        yield line.rstrip('\r\n')
+                        continue
+                    
+                    # 跳过格式错误的记录，避免中断整个数据流
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue
+                    text = record.get(field) if isinstance(record, dict) else None
+                    if isinstance(text, str):
+                        yield text
+    
+    def process_stream(self, texts: Iterable[str], min_length: int = 10, quality_threshold: float = 0.3,
+                       near_dup_threshold: float = None) -> Iterator[Tuple[str, dict]]:
+        """
+        process_batch的流式版本，内存占用有界
+        逐条拉取文本，依次完成去重、长度过滤、字符清洗和质量过滤，不构建中间列表。
+        去重记录以8字节指纹存放在磁盘上的内存映射表中（dedup_index，未配置时使用临时表），
+        内存占用不随唯一文本数量增长。
+        :param texts: 原始文本的可迭代对象（如iter_records的输出）
+        :param min_length: 最小长度阈值
+        :param quality_threshold: 质量阈值
+        :param near_dup_threshold: MinHash近似去重的Jaccard阈值（None表示不启用）；
+                                   启用后每条唯一文本额外保留一个定长签名
+        :return: (清洗后的文本, 实时统计信息)的迭代器；统计字典原地更新，如需快照请自行复制
+        """
+        stats = {
+            'original_count': 0,
+            'duplicates_removed': 0,
+            'short_texts_removed': 0,
+            'low_quality_removed': 0,
+            'other_removed': 0,
+            'final_count': 0
+        }
+        # 已见文本记录在磁盘指纹表中（持久索引或临时索引），内存不随唯一文本数增长
+        seen_index = self.dedup_index
+        tmp_dir = None
+        if seen_index is None:
+            tmp_dir = tempfile.mkdtemp(prefix='process_stream-')
+            seen_index = FingerprintIndex(os.path.join(tmp_dir, 'seen.idx'))
+        lsh = None
+        if near_dup_threshold is not None:
+            lsh = MinHashLSH(near_dup_threshold)
+            stats['near_duplicates_removed'] = 0
+        
+        try:
+            for text in texts:
+                stats['original_count'] += 1
+            
+                # 1. 去除重复文本
+                text_hash = self._text_digest(text)
+                if not seen_index.add(FingerprintIndex.fingerprint(text_hash)):
+                    stats['duplicates_removed'] += 1
+                    continue
+                if lsh is not None and lsh.check_and_insert(text) is not None:
+                    stats['near_duplicates_removed'] += 1
+                    continue
+            
+                # 2. 过滤过短文本
+                if len(text.strip()) < min_length:
+                    stats['short_texts_removed'] += 1
+                    continue
+            
+                # 3. 清理特殊字符和规范化
+                text_clean = self._clean_and_normalize(text)
+            
+                # 4. 过滤低质量文本
+                if not self._is_high_quality(text_clean, quality_threshold):
+                    stats['low_quality_removed'] += 1
+                    continue
+            
+                stats['final_count'] += 1
+                yield text_clean, stats
+        finally:
+            # 临时索引用完即删；持久索引在消费者提前停止时也要刷新，保证计数准确
+            if tmp_dir is None:
+                seen_index.flush()
+            else:
+                seen_index.close()
+                shutil.rmtree(tmp_dir, ignore_errors=True)
+
+
+# 工作进程内使用的清洗器（每个进程首次使用时创建一次）
+_worker_cleaner = None
+
+
+def _clean_shard(texts: List[str], quality_threshold: float) -> Tuple[List[str], int]:
+    """
+    在工作进程中对一个分片执行process_batch的逐条处理阶段
+    :param texts: 文本分片
+    :param quality_threshold: 质量阈值
+    :return: 高质量文本和去除的低质量文本数量
+    """
+    global _worker_cleaner
+    if _worker_cleaner is None:
+        _worker_cleaner = LLMDataCleaner()
+    cleaned = [_worker_cleaner._clean_and_normalize(text) for text in texts]
+    return _worker_cleaner.filter_low_quality_texts(cleaned, quality_threshold)
 
 
 # 使用示例
@@ -218,6 +644,7 @@ if __name__ == "__main__":
     ]
     
     # 初始化清洗器
+    # （传入dedup_index=FingerprintIndex("dedup.idx")可与历史批次一起去重）
     cleaner = LLMDataCleaner()
     
     # 批量处理文本
@@ -235,3 +662,7 @@ if __name__ == "__main__":
     print("\n清洗后的文本:")
     for i, text in enumerate(cleaned_texts, 1):
         print(f"{i}. {text}")
+    
+    # 流式模式：处理大文件时无需全部载入内存
+    # for text, running_stats in cleaner.process_stream(cleaner.iter_records(["data/crawl.jsonl"]), min_length=8):
+    #     output_file.write(text + "\n")
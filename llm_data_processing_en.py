@@ -1,22 +1,145 @@
 import re
+import json
 import string
+import os
+import shutil
 import hashlib
-from typing import List, Tuple
+import tempfile
+from itertools import repeat
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from typing import List, Tuple, Dict, Iterable, Iterator
 import nltk
 from nltk.corpus import stopwords
 from nltk.tokenize import word_tokenize
+from text_dedup import MinHashLSH, FingerprintIndex
+from pipeline_metrics import StageMetrics, NULL_METRICS
+from text_pipeline import StageRegistry
 
-# Download NLTK resources (required for first run)
-nltk.download('stopwords')
-nltk.download('punkt')
+# Tokenizer for the fast stopword removal path: words (with inner apostrophes/hyphens) or single symbols
+TOKEN_PATTERN = re.compile(r"\w+(?:['-]\w+)*|[^\w\s]")
 
-class LLMDataCleaner:
+# Default stage order for process_pipeline: cheap rejecting filters first, transforms on survivors
+DEFAULT_PIPELINE = [
+    'dedup',
+    {'stage': 'length_filter', 'min_length': 10},
+    'clean',
+    'case_normalize',
+    {'stage': 'quality_filter', 'quality_threshold': 0.3},
+]
+
+# Columns of the score matrix returned by LLMDataCleaner.score_texts
+SCORE_COLUMNS = ('length', 'stripped_length', 'non_punct_ratio', 'punct_ratio',
+                 'digit_ratio', 'upper_ratio', 'whitespace_ratio')
+# ASCII bytes deleted with bytes.translate to count each (ASCII-only) character class
+PUNCTUATION_BYTES = string.punctuation.encode('ascii')
+DIGIT_BYTES = string.digits.encode('ascii')
+UPPERCASE_BYTES = string.ascii_uppercase.encode('ascii')
+WHITESPACE_BYTES = string.whitespace.encode('ascii')
+
+
+def _encode_texts(texts: List[str]) -> List[bytes]:
+    """
+    UTF-8 encode texts for _count_ascii_class (lone surrogates are kept instead of raising)
+    :param texts: List of texts
+    :return: List of encoded texts
+    """
+    return [text.encode('utf-8', 'surrogatepass') for text in texts]
+
+
+def _count_ascii_class(encoded: List[bytes], delete: bytes) -> np.ndarray:
+    """
+    Count the characters of an ASCII character class in every text
+    In UTF-8 ASCII bytes only ever encode ASCII characters, so the count is the number of bytes
+    bytes.translate deletes; that runs entirely in C, without the per-character dict lookups of
+    str.translate.
+    :param encoded: Encoded texts from _encode_texts
+    :param delete: ASCII bytes of the character class
+    :return: Number of characters of the class per text
+    """
+    return np.fromiter((len(data) - len(data.translate(None, delete)) for data in encoded),
+                       dtype=np.int64, count=len(encoded))
+
+
+def _ensure_nltk_resource(resource_path: str, package: str) -> None:
+    """
+    Download an NLTK resource only if it is not installed yet
+    :param resource_path: Resource path as used by nltk.data.find
+    :param package: Package name passed to nltk.download
+    """
+    try:
+        nltk.data.find(resource_path)
+    except LookupError:
+        nltk.download(package)
+
+
+class _CharWhitelistTable(dict):
+    """
+    Lazily populated str.translate table equivalent to the whitelist regex in clean_special_characters
+    Each code point is classified once on first sight and cached, so translation runs in C.
+    """
+    def __missing__(self, codepoint: int):
+        char = chr(codepoint)
+        # \w == isalnum() or '_', \s == isspace() for str patterns
+        if char.isalnum() or char.isspace() or char in "_.,!?'\"-":
+            value = codepoint
+        else:
+            value = None
+        self[codepoint] = value
+        return value
+
+
+class CompiledCharacterCleaner:
+    """
+    Precompiled, fused implementation of LLMDataCleaner.clean_special_characters
+    Produces exactly the same output with fewer passes over the text:
+    regex passes are skipped when their trigger substrings are absent, the character
+    whitelist is a single str.translate call and whitespace collapse is split/join.
+    """
+    URL_PATTERN = re.compile(r'http\S+|www\S+')  # 'https' is already covered by 'http'
+    HTML_TAG_PATTERN = re.compile(r'<.*?>')
+    
     def __init__(self):
-        """Initialize data cleaning utility and load resources like stop words"""
+        self.whitelist_table = _CharWhitelistTable()
+    
+    def clean(self, text: str) -> str:
+        """
+        Clean special characters, garbled code, and extra spaces
+        :param text: Original text
+        :return: Cleaned text
+        """
+        # Remove URLs
+        if 'http' in text or 'www' in text:
+            text = self.URL_PATTERN.sub('', text)
+        
+        # Remove HTML tags
+        if '<' in text:
+            text = self.HTML_TAG_PATTERN.sub('', text)
+        
+        # Drop characters outside the whitelist, then merge whitespace runs into one space
+        text = text.translate(self.whitelist_table)
+        return ' '.join(text.split())
+
+
+class LLMDataCleaner:
+    def __init__(self, dedup_index: FingerprintIndex = None):
+        """
+        Initialize data cleaning utility and load resources like stop words
+        :param dedup_index: Optional persistent fingerprint index; texts seen in earlier runs are
+                            then treated as duplicates as well
+        """
+        # Download NLTK resources on first use (required for first run)
+        _ensure_nltk_resource('corpora/stopwords', 'stopwords')
         self.stop_words = set(stopwords.words('english'))  # English stop words
         # Extended custom stop words (can be extended as needed)
         self.custom_stop_words = {"http", "https", "www", "com", "html", "jpg", "png"}
         self.stop_words.update(self.custom_stop_words)
+        # Fused, precompiled engine for clean_special_characters
+        self.char_cleaner = CompiledCharacterCleaner()
+        self.dedup_index = dedup_index
+        # Named stages available to process_pipeline
+        self.stage_registry = StageRegistry()
+        self._register_default_stages()
         
     def remove_duplicates(self, texts: List[str]) -> Tuple[List[str], int]:
         """
@@ -30,35 +153,97 @@ class LLMDataCleaner:
         duplicates = 0
         
         for text in texts:
-            # Normalize text before hashing (ignore case and leading/trailing spaces)
-            text_normalized = text.strip().lower()
-            text_hash = hashlib.md5(text_normalized.encode()).hexdigest()
+            text_hash = self._text_digest(text)
             
-            if text_hash not in seen:
+            if text_hash not in seen and self._is_new_across_runs(text_hash):
                 seen.add(text_hash)
                 unique_texts.append(text)
             else:
                 duplicates += 1
+        
+        if self.dedup_index is not None:
+            self.dedup_index.flush()
                 
         return unique_texts, duplicates
     
-    def filter_short_texts(self, texts: List[str], min_length: int = 10) -> Tuple[List[str], int]:
+    def _is_new_across_runs(self, text_hash: bytes) -> bool:
+        """
+        Check a digest against the persistent index (if configured) and record it
+        :param text_hash: Digest returned by _text_digest
+        :return: False if the text was ingested in an earlier run
+        """
+        if self.dedup_index is None:
+            return True
+        return self.dedup_index.add(FingerprintIndex.fingerprint(text_hash))
+    
+    def _text_digest(self, text: str) -> bytes:
+        """
+        Compute the deduplication digest of a text
+        :param text: Original text
+        :return: 16-byte MD5 digest of the normalized text
+        """
+        # Normalize text before hashing (ignore case and leading/trailing spaces)
+        text_normalized = text.strip().lower()
+        return hashlib.md5(text_normalized.encode()).digest()
+    
+    def remove_near_duplicates(self, texts: List[str], threshold: float = 0.8, num_perm: int = 128,
+                               shingle_size: int = 5) -> Tuple[List[str], int, Dict[int, List[int]]]:
+        """
+        Remove near-duplicate texts (e.g. pages differing only by a date or tracking parameter)
+        using MinHash signatures and LSH banding
+        :param texts: List of texts
+        :param threshold: Jaccard similarity threshold above which texts count as duplicates
+        :param num_perm: Number of MinHash permutations
+        :param shingle_size: Number of characters per shingle
+        :return: Tuple of (deduplicated text list, number of near duplicates removed,
+                 clusters mapping the index of each kept text to the indices of its duplicates)
+        """
+        lsh = MinHashLSH(threshold, num_perm, shingle_size)
+        kept, clusters = lsh.deduplicate(texts)
+        return [texts[i] for i in kept], len(texts) - len(kept), clusters
+    
+    def filter_short_texts(self, texts: List[str], min_length: int = 10, scores: np.ndarray = None) -> Tuple[List[str], int]:
         """
         Filter out excessively short texts (usually containing noise)
         :param texts: List of texts
         :param min_length: Minimum character length threshold
+        :param scores: Optional score matrix from score_texts (avoids re-stripping every text)
         :return: Tuple of (filtered text list, number of short texts removed)
         """
-        filtered = []
-        removed = 0
+        if scores is None:
+            stripped_lengths = np.fromiter((len(text.strip()) for text in texts), dtype=np.int64, count=len(texts))
+        else:
+            stripped_lengths = scores[:, SCORE_COLUMNS.index('stripped_length')]
         
-        for text in texts:
-            if len(text.strip()) >= min_length:
-                filtered.append(text)
-            else:
-                removed += 1
-                
-        return filtered, removed
+        keep = stripped_lengths >= min_length
+        filtered = [text for text, kept in zip(texts, keep) if kept]
+        return filtered, len(texts) - len(filtered)
+    
+    def score_texts(self, texts: List[str]) -> np.ndarray:
+        """
+        Compute quality signals for a whole batch at once
+        Character classes are counted on the UTF-8 bytes by _count_ascii_class instead of
+        per-character Python loops; ratios are computed as vectorized array operations.
+        :param texts: List of texts
+        :return: Float matrix of shape (len(texts), len(SCORE_COLUMNS)); ratios are NaN for empty texts
+        """
+        count = len(texts)
+        lengths = np.fromiter(map(len, texts), dtype=np.int64, count=count)
+        stripped_lengths = np.fromiter((len(text.strip()) for text in texts), dtype=np.int64, count=count)
+        
+        encoded = _encode_texts(texts)
+        punctuation = _count_ascii_class(encoded, PUNCTUATION_BYTES)
+        scores = np.empty((count, len(SCORE_COLUMNS)), dtype=np.float64)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            scores[:, 0] = lengths
+            scores[:, 1] = stripped_lengths
+            # Same expression as _is_high_quality so thresholds give identical results
+            scores[:, 2] = (lengths - punctuation) / lengths
+            scores[:, 3] = punctuation / lengths
+            scores[:, 4] = _count_ascii_class(encoded, DIGIT_BYTES) / lengths
+            scores[:, 5] = _count_ascii_class(encoded, UPPERCASE_BYTES) / lengths
+            scores[:, 6] = _count_ascii_class(encoded, WHITESPACE_BYTES) / lengths
+        return scores
     
     def clean_special_characters(self, text: str) -> str:
         """
@@ -80,20 +265,47 @@ class LLMDataCleaner:
         
         return text
     
-    def remove_stopwords(self, text: str, language: str = 'english') -> str:
+    def clean_special_characters_fast(self, text: str) -> str:
+        """
+        Fast equivalent of clean_special_characters (identical output)
+        :param text: Original text
+        :return: Cleaned text
+        """
+        return self.char_cleaner.clean(text)
+    
+    def remove_stopwords(self, text: str, language: str = 'english', backend: str = 'nltk') -> str:
         """
         Remove stop words (optional step, depends on model requirements)
         :param text: Original text
         :param language: Language (currently supports English)
+        :param backend: 'nltk' (exact Treebank tokenization, slow) or 'regex' (precompiled tokenizer, fast)
         :return: Text with stop words removed
         """
         if language != 'english':
             return text  # Can be extended to support other languages
+        if backend == 'regex':
+            return self.remove_stopwords_batch([text], language)[0]
         
+        _ensure_nltk_resource('tokenizers/punkt', 'punkt')
         words = word_tokenize(text)
         filtered_words = [word for word in words if word.lower() not in self.stop_words]
         return ' '.join(filtered_words)
     
+    def remove_stopwords_batch(self, texts: List[str], language: str = 'english') -> List[str]:
+        """
+        Fast stop word removal over many texts using the precompiled regex tokenizer
+        Contractions stay whole (e.g. "don't"), unlike NLTK which splits them ("do", "n't").
+        :param texts: List of texts
+        :param language: Language (currently supports English)
+        :return: Texts with stop words removed
+        """
+        if language != 'english':
+            return list(texts)
+        
+        stop_words = self.stop_words  # the set itself: no per-call copy, and later edits still apply
+        find_tokens = TOKEN_PATTERN.findall
+        return [' '.join([word for word in find_tokens(text) if word.lower() not in stop_words]) for text in texts]
+    
     def normalize_case(self, text: str, case: str = 'lower') -> str:
         """
         Normalize text case (usually convert to lowercase to reduce vocabulary size)
@@ -107,32 +319,45 @@ class LLMDataCleaner:
             return text.upper()
         return text
     
-    def filter_low_quality_texts(self, texts: List[str], quality_threshold: float = 0.3) -> Tuple[List[str], int]:
+    def filter_low_quality_texts(self, texts: List[str], quality_threshold: float = 0.3,
+                                 scores: np.ndarray = None) -> Tuple[List[str], int]:
         """
         Filter low-quality texts (based on proportion of non-punctuation characters)
         :param texts: List of texts
         :param quality_threshold: Threshold for proportion of non-punctuation characters
+        :param scores: Optional score matrix from score_texts (computed if not given)
         :return: Tuple of (filtered text list, number of low-quality texts removed)
         """
-        filtered = []
-        removed = 0
+        if scores is None:
+            # Only the punctuation count is needed, not the whole score matrix
+            lengths = np.fromiter(map(len, texts), dtype=np.int64, count=len(texts))
+            punctuation = _count_ascii_class(_encode_texts(texts), PUNCTUATION_BYTES)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                non_punct_ratio = (lengths - punctuation) / lengths
+        else:
+            non_punct_ratio = scores[:, SCORE_COLUMNS.index('non_punct_ratio')]
         
-        for text in texts:
-            if not text:
-                removed += 1
-                continue
-                
-            # Calculate ratio of non-punctuation characters
-            total_chars = len(text)
-            punctuation_chars = sum(1 for c in text if c in string.punctuation)
-            non_punct_ratio = (total_chars - punctuation_chars) / total_chars
-            
-            if non_punct_ratio >= quality_threshold:
-                filtered.append(text)
-            else:
-                removed += 1
-                
-        return filtered, removed
+        # Empty texts have a NaN ratio, which never passes the comparison
+        keep = non_punct_ratio >= quality_threshold
+        filtered = [text for text, kept in zip(texts, keep) if kept]
+        return filtered, len(texts) - len(filtered)
+    
+    def _is_high_quality(self, text: str, quality_threshold: float) -> bool:
+        """
+        Check a single text against the non-punctuation ratio threshold
+        :param text: Text to check
+        :param quality_threshold: Threshold for proportion of non-punctuation characters
+        :return: True if the text should be kept
+        """
+        if not text:
+            return False
+        
+        # Calculate ratio of non-punctuation characters
+        total_chars = len(text)
+        data = text.encode('utf-8', 'surrogatepass')
+        punctuation_chars = len(data) - len(data.translate(None, PUNCTUATION_BYTES))
+        non_punct_ratio = (total_chars - punctuation_chars) / total_chars
+        return non_punct_ratio >= quality_threshold
     
     def detect_language(self, text: str) -> str:
         """
@@ -149,14 +374,36 @@ class LLMDataCleaner:
         else:
             return 'other'
     
-    def process_batch(self, texts: List[str], min_length: int = 10, quality_threshold: float = 0.3) -> Tuple[List[str], dict]:
+    def _clean_and_normalize(self, text: str) -> str:
+        """
+        Per-text cleaning step shared by process_batch and process_stream
+        :param text: Original text
+        :return: Cleaned text (lowercased if English)
+        """
+        # Clean special characters
+        text_clean = self.clean_special_characters_fast(text)
+        # Normalize case (for English)
+        lang = self.detect_language(text_clean)
+        if lang == 'en':
+            text_clean = self.normalize_case(text_clean, 'lower')
+        return text_clean
+    
+    def process_batch(self, texts: List[str], min_length: int = 10, quality_threshold: float = 0.3,
+                      near_dup_threshold: float = None, workers: int = 1,
+                      metrics: StageMetrics = None) -> Tuple[List[str], dict]:
         """
         Complete processing pipeline for batch text cleaning
         :param texts: Original list of texts
         :param min_length: Minimum length threshold
         :param quality_threshold: Quality threshold for filtering
+        :param near_dup_threshold: Jaccard threshold for MinHash near-duplicate removal (None to disable)
+        :param workers: Number of worker processes for the per-text stages (deduplication always
+                        runs in the calling process, so results match the serial run)
+        :param metrics: Optional StageMetrics collecting wall/CPU time and items/bytes in and out per stage;
+                        the totals are also returned in stats['stages']
         :return: Tuple of (cleaned text list, processing statistics)
         """
+        metrics = metrics or NULL_METRICS
         stats = {
             'original_count': len(texts),
             'duplicates_removed': 0,
@@ -167,37 +414,229 @@ class LLMDataCleaner:
         }
         
         # 1. Remove duplicate texts
-        unique_texts, duplicates = self.remove_duplicates(texts)
+        with metrics.stage('remove_duplicates', texts) as record:
+            unique_texts, duplicates = self.remove_duplicates(texts)
+            record.set_output(unique_texts)
         stats['duplicates_removed'] = duplicates
         
+        # Optionally remove near duplicates
+        if near_dup_threshold is not None:
+            with metrics.stage('remove_near_duplicates', unique_texts) as record:
+                unique_texts, near_duplicates, clusters = self.remove_near_duplicates(unique_texts, near_dup_threshold)
+                record.set_output(unique_texts)
+            stats['near_duplicates_removed'] = near_duplicates
+            stats['near_duplicate_clusters'] = len(clusters)
+        
         # 2. Filter out short texts
-        filtered_length, short_removed = self.filter_short_texts(unique_texts, min_length)
+        with metrics.stage('filter_short_texts', unique_texts) as record:
+            filtered_length, short_removed = self.filter_short_texts(unique_texts, min_length)
+            record.set_output(filtered_length)
         stats['short_texts_removed'] = short_removed
         
-        # 3. Clean special characters and normalize
-        cleaned = []
-        for text in filtered_length:
-            # Clean special characters
-            text_clean = self.clean_special_characters(text)
-            # Normalize case (for English)
-            lang = self.detect_language(text_clean)
-            if lang == 'en':
-                text_clean = self.normalize_case(text_clean, 'lower')
-            cleaned.append(text_clean)
-        
-        # 4. Filter low quality texts
-        high_quality, low_quality_removed = self.filter_low_quality_texts(cleaned, quality_threshold)
+        # 3. Clean special characters and normalize, 4. Filter low quality texts
+        if workers > 1:
+            with metrics.stage('clean_and_filter_parallel', filtered_length) as record:
+                high_quality, low_quality_removed = self._clean_and_filter_parallel(filtered_length, quality_threshold, workers)
+                record.set_output(high_quality)
+        else:
+            with metrics.stage('clean_and_normalize', filtered_length) as record:
+                cleaned = [self._clean_and_normalize(text) for text in filtered_length]
+                record.set_output(cleaned)
+            with metrics.stage('filter_low_quality_texts', cleaned) as record:
+                high_quality, low_quality_removed = self.filter_low_quality_texts(cleaned, quality_threshold)
+                record.set_output(high_quality)
         stats['low_quality_removed'] = low_quality_removed
         
         # 5. Final statistics
         stats['final_count'] = len(high_quality)
         stats['other_removed'] = stats['original_count'] - stats['final_count'] - sum([
             stats['duplicates_removed'],
+            stats.get('near_duplicates_removed', 0),
             stats['short_texts_removed'],
             stats['low_quality_removed']
         ])
+        if metrics.enabled:
+            stats['stages'] = metrics.report()
         
         return high_quality, stats
+    
+    def _clean_and_filter_parallel(self, texts: List[str], quality_threshold: float, workers: int) -> Tuple[List[str], int]:
+        """
+        Run cleaning, case normalization and quality filtering on a process pool
+        :param texts: Deduplicated, length-filtered texts
+        :param quality_threshold: Quality threshold for filtering
+        :param workers: Number of worker processes
+        :return: Tuple of (high quality texts in input order, number of low-quality texts removed)
+        """
+        # Several contiguous shards per worker keep the pool balanced; map() preserves shard order
+        shard_size = max(1, -(-len(texts) // (workers * 4)))
+        shards = [texts[i:i + shard_size] for i in range(0, len(texts), shard_size)]
+        
+        high_quality = []
+        removed = 0
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            for shard_kept, shard_removed in executor.map(_clean_shard, shards, repeat(quality_threshold)):
+                high_quality.extend(shard_kept)
+                removed += shard_removed
+        return high_quality, removed
+    
+    def _register_default_stages(self) -> None:
+        """Register the built-in pipeline stages"""
+        registry = self.stage_registry
+        registry.register('dedup', 'batch', lambda: lambda texts: self.remove_duplicates(texts)[0])
+        registry.register('near_dedup', 'batch',
+                          lambda threshold=0.8: lambda texts: self.remove_near_duplicates(texts, threshold)[0])
+        registry.register('length_filter', 'filter',
+                          lambda min_length=10: lambda text: len(text.strip()) >= min_length)
+        registry.register('clean', 'map', lambda: self.clean_special_characters_fast)
+        registry.register('lang_filter', 'filter',
+                          lambda languages=('en', 'zh'): lambda text: self.detect_language(text) in languages)
+        registry.register('case_normalize', 'map',
+                          lambda: lambda text: self.normalize_case(text, 'lower') if self.detect_language(text) == 'en' else text)
+        registry.register('stopwords', 'map', lambda: lambda text: self.remove_stopwords(text, backend='regex'))
+        registry.register('quality_filter', 'filter',
+                          lambda quality_threshold=0.3: lambda text: self._is_high_quality(text, quality_threshold))
+    
+    def register_stage(self, name: str, kind: str, factory) -> None:
+        """
+        Register a custom pipeline stage (e.g. AdvancedLLMCleaner.desensitize_text)
+        Example: cleaner.register_stage('desensitize', 'map', lambda lang='en': lambda t: adv.desensitize_text(t, lang) or None)
+        :param name: Stage name used in pipeline configs
+        :param kind: 'filter' (predicate), 'map' (transform, None drops the text) or 'batch' (whole list)
+        :param factory: Callable taking the stage parameters from the config and returning the stage function
+        """
+        self.stage_registry.register(name, kind, factory)
+    
+    def process_pipeline(self, texts: List[str], config: List = None, metrics: StageMetrics = None) -> Tuple[List[str], dict]:
+        """
+        Run a configurable cleaning pipeline
+        Adjacent per-item stages are fused so every document is traversed once per run of
+        filters/transforms, and stops at the first filter that rejects it.
+        With DEFAULT_PIPELINE the output equals process_batch with the same thresholds.
+        :param texts: Original list of texts
+        :param config: Ordered stage names or dicts with parameters (defaults to DEFAULT_PIPELINE)
+        :param metrics: Optional StageMetrics (fused stage groups are measured as one stage)
+        :return: Tuple of (cleaned text list, statistics including removals per stage)
+        """
+        pipeline = self.stage_registry.build(config or DEFAULT_PIPELINE)
+        return pipeline.run(texts, metrics)
+    
+    def iter_records(self, file_paths: Iterable[str], field: str = 'text') -> Iterator[str]:
+        """
+        Lazily read texts from plain-text files (one text per line) or JSONL files
+        :param file_paths: Input file paths (files ending in .jsonl/.ndjson are parsed as JSON records)
+        :param field: Name of the text field in JSONL records
+        :return: Iterator of raw texts
+        """
+        for file_path in file_paths:
+            is_jsonl = file_path.endswith(('.jsonl', '.ndjson'))
+            with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
+                for line in f:
+                    if not line.strip():
+                        continue
+                    if not is_jsonl:
+                        yield line.rstrip('\r\n')
+                        continue
+                    
+                    # Skip malformed records instead of aborting the whole stream
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue
+                    text = record.get(field) if isinstance(record, dict) else None
+                    if isinstance(text, str):
+                        yield text
+    
+    def process_stream(self, texts: Iterable[str], min_length: int = 10, quality_threshold: float = 0.3,
+                       near_dup_threshold: float = None) -> Iterator[Tuple[str, dict]]:
+        """
+        Streaming version of process_batch with bounded memory usage
+        Texts are pulled one at a time and pass through deduplication, length filtering,
+        character cleaning and quality filtering without building intermediate lists.
+        Seen texts are kept as 8-byte fingerprints in a memory-mapped table on disk (dedup_index,
+        or a temporary one), so memory does not grow with the number of unique texts.
+        :param texts: Iterable of raw texts (e.g. the output of iter_records)
+        :param min_length: Minimum length threshold
+        :param quality_threshold: Quality threshold for filtering
+        :param near_dup_threshold: Jaccard threshold for MinHash near-duplicate removal (None to disable);
+                                   adds a fixed-size signature per unique text to the retained state
+        :return: Iterator of (cleaned text, running statistics); the statistics dict is
+                 updated in place, copy it if a snapshot is needed
+        """
+        stats = {
+            'original_count': 0,
+            'duplicates_removed': 0,
+            'short_texts_removed': 0,
+            'low_quality_removed': 0,
+            'other_removed': 0,
+            'final_count': 0
+        }
+        # Seen texts go to an on-disk fingerprint table (the persistent index, or a temporary
+        # one), so memory stays flat however many unique texts the stream contains
+        seen_index = self.dedup_index
+        tmp_dir = None
+        if seen_index is None:
+            tmp_dir = tempfile.mkdtemp(prefix='process_stream-')
+            seen_index = FingerprintIndex(os.path.join(tmp_dir, 'seen.idx'))
+        lsh = None
+        if near_dup_threshold is not None:
+            lsh = MinHashLSH(near_dup_threshold)
+            stats['near_duplicates_removed'] = 0
+        
+        try:
+            for text in texts:
+                stats['original_count'] += 1
+            
+                # 1. Remove duplicate texts
+                text_hash = self._text_digest(text)
+                if not seen_index.add(FingerprintIndex.fingerprint(text_hash)):
+                    stats['duplicates_removed'] += 1
+                    continue
+                if lsh is not None and lsh.check_and_insert(text) is not None:
+                    stats['near_duplicates_removed'] += 1
+                    continue
+            
+                # 2. Filter out short texts
+                if len(text.strip()) < min_length:
+                    stats['short_texts_removed'] += 1
+                    continue
+            
+                # 3. Clean special characters and normalize
+                text_clean = self._clean_and_normalize(text)
+            
+                # 4. Filter low quality texts
+                if not self._is_high_quality(text_clean, quality_threshold):
+                    stats['low_quality_removed'] += 1
+                    continue
+            
+                stats['final_count'] += 1
+                yield text_clean, stats
+        finally:
+            # Remove the temporary index; flush the persistent one even if the consumer stops
+            # early, so its count stays accurate
+            if tmp_dir is None:
+                seen_index.flush()
+            else:
+                seen_index.close()
+                shutil.rmtree(tmp_dir, ignore_errors=True)
+
+
+# Cleaner used inside worker processes (created once per process on first use)
+_worker_cleaner = None
+
+
+def _clean_shard(texts: List[str], quality_threshold: float) -> Tuple[List[str], int]:
+    """
+    Per-text stages of process_batch for one shard, executed in a worker process
+    :param texts: Shard of texts
+    :param quality_threshold: Quality threshold for filtering
+    :return: Tuple of (high quality texts, number of low-quality texts removed)
+    """
+    global _worker_cleaner
+    if _worker_cleaner is None:
+        _worker_cleaner = LLMDataCleaner()
+    cleaned = [_worker_cleaner._clean_and_normalize(text) for text in texts]
+    return _worker_cleaner.filter_low_quality_texts(cleaned, quality_threshold)
 
 
 # Usage example
@@ -215,6 +654,7 @@ if __name__ == "__main__":
     ]
     
     # Initialize cleaner
+    # (pass dedup_index=FingerprintIndex("dedup.idx") to deduplicate against earlier runs)
     cleaner = LLMDataCleaner()
     
     # Process text batch
@@ -232,4 +672,8 @@ if __name__ == "__main__":
     print("\nCleaned texts:")
     for i, text in enumerate(cleaned_texts, 1):
         print(f"{i}. {text}")
+    
+    # Streaming mode: process large files without loading them into memory
+    # for text, running_stats in cleaner.process_stream(cleaner.iter_records(["data/crawl.jsonl"]), min_length=8):
+    #     output_file.write(text + "\n")
     
\ No newline at end of file
@@ -0,0 +1,165 @@
+import time
+from typing import Callable, Dict, Tuple
+
+# Fields tracked for every pipeline stage
+RECORD_FIELDS = ('calls', 'wall_time', 'cpu_time', 'items_in', 'items_out', 'bytes_in', 'bytes_out')
+
+
+def _measure(items) -> Tuple[int, int]:
+    """
+    Count items and UTF-8 bytes of a stage input or output
+    :param items: A single text, a list of texts, an item count or None
+    :return: Tuple of (item count, byte count)
+    """
+    if items is None:
+        return 0, 0
+    if isinstance(items, int):
+        return items, 0
+    if isinstance(items, str):
+        return 1, len(items.encode('utf-8'))
+    return len(items), sum(len(item.encode('utf-8')) for item in items if isinstance(item, str))
+
+
+class StageRecord:
+    """Measurements of a single stage invocation"""
+    __slots__ = RECORD_FIELDS
+
+    def __init__(self, items_in):
+        self.calls = 1
+        self.wall_time = 0.0
+        self.cpu_time = 0.0
+        self.items_in, self.bytes_in = _measure(items_in)
+        self.items_out, self.bytes_out = 0, 0
+
+    def set_output(self, items) -> None:
+        """
+        Record the stage output
+        :param items: A single text, a list of texts, an item count or None
+        """
+        self.items_out, self.bytes_out = _measure(items)
+
+    def as_dict(self) -> dict:
+        return {field: getattr(self, field) for field in RECORD_FIELDS}
+
+
+class _StageTimer:
+    """Context manager timing one stage invocation and reporting it to StageMetrics"""
+    __slots__ = ('metrics', 'name', 'record', 'wall_start', 'cpu_start')
+
+    def __init__(self, metrics: 'StageMetrics', name: str, items_in):
+        self.metrics = metrics
+        self.name = name
+        self.record = StageRecord(items_in)
+
+    def __enter__(self) -> StageRecord:
+        self.wall_start = time.perf_counter()
+        self.cpu_start = time.process_time()
+        return self.record
+
+    def __exit__(self, exc_type, exc_value, traceback) -> bool:
+        self.record.wall_time = time.perf_counter() - self.wall_start
+        self.record.cpu_time = time.process_time() - self.cpu_start
+        self.metrics.add(self.name, self.record.as_dict())
+        return False
+
+
+class StageMetrics:
+    """
+    Opt-in per-stage instrumentation: wall time, CPU time, items and bytes in/out
+    Pass an instance to a pipeline to enable it; totals per stage are available from report()
+    and every finished stage invocation is forwarded to the optional callback.
+    CPU time covers the measuring process only (work done in worker processes is not included).
+    """
+    enabled = True
+
+    def __init__(self, callback: Callable[[str, dict], None] = None):
+        """
+        :param callback: Optional hook called as callback(stage_name, record) after each stage
+        """
+        self.callback = callback
+        self.stages = {}
+
+    def stage(self, name: str, items_in=None) -> _StageTimer:
+        """
+        Measure a stage
+        Usage: with metrics.stage('clean', texts) as record: ...; record.set_output(result)
+        :param name: Stage name
+        :param items_in: Stage input (text, list of texts or item count)
+        :return: Context manager yielding a StageRecord
+        """
+        return _StageTimer(self, name, items_in)
+
+    def add(self, name: str, record: dict) -> None:
+        """
+        Accumulate a stage record (e.g. one produced in another process) and notify the callback
+        :param name: Stage name
+        :param record: Dict with the fields in RECORD_FIELDS
+        """
+        totals = self.stages.setdefault(name, dict.fromkeys(RECORD_FIELDS, 0))
+        for field in RECORD_FIELDS:
+            totals[field] += record.get(field, 0)
+        if self.callback is not None:
+            self.callback(name, record)
+
+    def merge(self, report: Dict[str, dict]) -> None:
+        """
+        Merge a report from another StageMetrics instance
+        :param report: Output of report()
+        """
+        for name, record in report.items():
+            self.add(name, record)
+
+    def report(self) -> Dict[str, dict]:
+        """
+        Totals per stage, with throughput derived from wall time
+        :return: Mapping of stage name to its accumulated record
+        """
+        report = {}
+        for name, totals in self.stages.items():
+            record = dict(totals)
+            wall_time = totals['wall_time']
+            record['items_per_sec'] = totals['items_in'] / wall_time if wall_time else 0.0
+            record['mb_per_sec'] = totals['bytes_in'] / (1024 * 1024) / wall_time if wall_time else 0.0
+            report[name] = record
+        return report
+
+
+class _NullRecord:
+    __slots__ = ()
+
+    def set_output(self, items) -> None:
+        pass
+
+
+class _NullStageTimer:
+    __slots__ = ()
+
+    def __enter__(self) -> _NullRecord:
+        return _NULL_RECORD
+
+    def __exit__(self, exc_type, exc_value, traceback) -> bool:
+        return False
+
+
+_NULL_RECORD = _NullRecord()
+_NULL_STAGE_TIMER = _NullStageTimer()
+
+
+class NullMetrics:
+    """Disabled instrumentation: every call is a no-op on shared singletons"""
+    enabled = False
+
+    def stage(self, name: str, items_in=None) -> _NullStageTimer:
+        return _NULL_STAGE_TIMER
+
+    def add(self, name: str, record: dict) -> None:
+        pass
+
+    def merge(self, report: Dict[str, dict]) -> None:
+        pass
+
+    def report(self) -> Dict[str, dict]:
+        return {}
+
+
+NULL_METRICS = NullMetrics()
@@ -0,0 +1,145 @@
+import os
+import json
+import time
+import hashlib
+from typing import Dict, Set, Tuple, Optional
+
+MANIFEST_NAME = '_manifest.jsonl'
+# Prefix of the output shards written next to the manifest
+OUTPUT_PREFIX = 'part-'
+
+
+def block_id(block: Tuple[str, int, Optional[int]]) -> str:
+    """
+    Stable identifier of an input block (same file and byte range give the same id across runs)
+    :param block: (path, start, end)
+    :return: 16 hex characters
+    """
+    path, start, end = block
+    key = f"{os.path.abspath(path)}\0{start}\0{end}"
+    return hashlib.sha1(key.encode('utf-8')).hexdigest()[:16]
+
+
+def input_fingerprint(path: str) -> Dict[str, int]:
+    """Size and modification time of an input file, used to detect inputs changed since a run"""
+    stat = os.stat(path)
+    return {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+
+
+def file_sha256(path: str) -> str:
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+class RunManifest:
+    """
+    Append-only record of completed input blocks in an output directory
+    Every finished block appends one JSON line (input range and fingerprint, output format and
+    per output shard its file, record count, size and checksum) with a single O_APPEND write, so concurrent workers do
+    not interleave entries and a crash can at most truncate the last line, which is ignored.
+    """
+    def __init__(self, output_dir: str):
+        self.output_dir = output_dir
+        self.path = os.path.join(output_dir, MANIFEST_NAME)
+
+    def entries(self) -> Dict[str, dict]:
+        """
+        Load the manifest
+        :return: Latest entry per block id
+        """
+        entries = {}
+        if not os.path.exists(self.path):
+            return entries
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    continue  # truncated by a crash mid-write
+                entries[entry['block_id']] = entry
+        return entries
+
+    def record(self, entry: dict) -> None:
+        """
+        Append the entry of a completed block
+        :param entry: JSON-serializable dict with at least 'block_id'
+        """
+        entry = dict(entry, completed_at=time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()))
+        data = (json.dumps(entry, ensure_ascii=False) + '\n').encode('utf-8')
+        fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            os.write(fd, data)
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+    def completed(self, verify: bool = False) -> Set[str]:
+        """
+        Block ids whose recorded work is still valid: the input file is unchanged and the output
+        file exists with the recorded size (and checksum when verify is True)
+        :param verify: Re-hash every output file
+        :return: Set of block ids that can be skipped
+        """
+        return self._completed(self.entries(), verify)
+
+    def _completed(self, entries: Dict[str, dict], verify: bool) -> Set[str]:
+        done = set()
+        for bid, entry in entries.items():
+            try:
+                if input_fingerprint(entry['input']) != entry['input_fingerprint']:
+                    continue
+                if all(self._output_valid(output, verify) for output in entry['outputs']):
+                    done.add(bid)
+            except (OSError, KeyError):
+                continue
+        return done
+
+    def _output_valid(self, output: dict, verify: bool) -> bool:
+        output_path = os.path.join(self.output_dir, output['file'])
+        if os.path.getsize(output_path) != output['bytes']:
+            return False
+        return not verify or file_sha256(output_path) == output['sha256']
+
+    def recover(self, verify: bool = False) -> Set[str]:
+        """
+        Prepare the manifest for a resumed run and return the completed blocks
+        A line truncated by a crash is terminated so that new entries start on a line of their own.
+        Output shards that do not belong to a completed block are removed: those of blocks that are
+        recomputed, of blocks whose input changed (an appended file moves the end of its last block,
+        which gives it a new id) and of attempts that crashed before being recorded.
+        :param verify: Re-hash every output file
+        :return: Set of block ids that can be skipped
+        """
+        self._remove_temporary_files()
+        if os.path.exists(self.path) and os.path.getsize(self.path) > 0:
+            with open(self.path, 'rb+') as f:
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b'\n':
+                    f.write(b'\n')
+        entries = self.entries()
+        done = self._completed(entries, verify)
+        keep = {output['file'] for bid in done for output in entries[bid]['outputs']}
+        self._remove_outputs(keep)
+        return done
+
+    def reset(self) -> None:
+        """Start a fresh run: remove the manifest and all output shards in the directory"""
+        self._remove_temporary_files()
+        self._remove_outputs(set())
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+    def _remove_outputs(self, keep: Set[str]) -> None:
+        """Remove every output shard in the directory except the given file names"""
+        for name in os.listdir(self.output_dir):
+            if name.startswith(OUTPUT_PREFIX) and name not in keep:
+                os.remove(os.path.join(self.output_dir, name))
+
+    def _remove_temporary_files(self) -> None:
+        """Remove temporary files left behind by writers that crashed before their rename"""
+        for name in os.listdir(self.output_dir):
+            if '.tmp-' in name:
+                os.remove(os.path.join(self.output_dir, name))
@@ -0,0 +1,153 @@
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+from typing import List, Dict, Any
+
+# SQLite limits the number of bound parameters per statement, so lookups are chunked
+QUERY_CHUNK_SIZE = 500
+
+
+class ScoreCache:
+    """
+    Persistent content-addressed cache for model outputs (language ID, quality scores, NER spans)
+    Entries are keyed by a hash of the model namespace (model name and version) plus the text,
+    so unchanged documents are not re-scored across runs while a model upgrade misses cleanly.
+    Values are stored as JSON in an embedded SQLite database; when the number of entries exceeds
+    max_entries, the least recently used ones are evicted down to evict_to * max_entries.
+    """
+    def __init__(self, path: str, max_entries: int = 10000000, evict_to: float = 0.9):
+        """
+        :param path: SQLite database file
+        :param max_entries: Maximum number of cached entries
+        :param evict_to: Fraction of max_entries kept after an eviction
+        """
+        self.path = path
+        self.max_entries = max_entries
+        self.evict_to = evict_to
+        self.stats = {}
+        self._lock = threading.Lock()
+        self._connection = None
+        self._entries = None
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open the database on first use (also after the cache was shipped to another process)"""
+        if self._connection is None:
+            connection = sqlite3.connect(self.path, timeout=60, check_same_thread=False)
+            # WAL lets several worker processes read while one of them writes
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS scores (key BLOB PRIMARY KEY, value TEXT NOT NULL, last_used INTEGER NOT NULL)"
+            )
+            connection.execute("CREATE INDEX IF NOT EXISTS scores_last_used ON scores (last_used)")
+            connection.commit()
+            self._entries = connection.execute("SELECT COUNT(*) FROM scores").fetchone()[0]
+            self._connection = connection
+        return self._connection
+
+    @staticmethod
+    def key(namespace: str, text: str) -> bytes:
+        """
+        Cache key of a text under a model namespace
+        :param namespace: Task plus model name and version, e.g. 'quality:<model>:torch:base'
+        :param text: Input text
+        :return: 16-byte BLAKE2b digest
+        """
+        return hashlib.blake2b(namespace.encode("utf-8") + b"\0" + text.encode("utf-8"), digest_size=16).digest()
+
+    def get_many(self, namespace: str, texts: List[str]) -> List[Any]:
+        """
+        Look up cached values
+        :param namespace: Model namespace
+        :param texts: Input texts
+        :return: Cached value for every text (None on a miss)
+        """
+        keys = [self.key(namespace, text) for text in texts]
+        found = {}
+        with self._lock:
+            connection = self._connect()
+            for start in range(0, len(keys), QUERY_CHUNK_SIZE):
+                chunk = keys[start:start + QUERY_CHUNK_SIZE]
+                rows = connection.execute(
+                    f"SELECT key, value FROM scores WHERE key IN ({','.join('?' * len(chunk))})", chunk
+                ).fetchall()
+                found.update(rows)
+            if found:
+                # Refresh recency of the hits for LRU eviction
+                now = int(time.time())
+                connection.executemany("UPDATE scores SET last_used = ? WHERE key = ?", [(now, k) for k in found])
+                connection.commit()
+
+            counts = self.stats.setdefault(namespace, {"hits": 0, "misses": 0})
+            hits = sum(1 for k in keys if k in found)
+            counts["hits"] += hits
+            counts["misses"] += len(keys) - hits
+        return [json.loads(found[k]) if k in found else None for k in keys]
+
+    def put_many(self, namespace: str, texts: List[str], values: List[Any]) -> None:
+        """
+        Store values (JSON-serializable) for texts
+        :param namespace: Model namespace
+        :param texts: Input texts
+        :param values: Value for every text
+        """
+        if not texts:
+            return
+        now = int(time.time())
+        rows = [(self.key(namespace, text), json.dumps(value, ensure_ascii=False), now)
+                for text, value in zip(texts, values)]
+        with self._lock:
+            connection = self._connect()
+            connection.executemany("INSERT OR REPLACE INTO scores (key, value, last_used) VALUES (?, ?, ?)", rows)
+            connection.commit()
+            self._entries += len(rows)
+            if self._entries > self.max_entries:
+                self._evict(connection)
+
+    def _evict(self, connection: sqlite3.Connection) -> None:
+        """Delete the least recently used entries down to evict_to * max_entries"""
+        self._entries = connection.execute("SELECT COUNT(*) FROM scores").fetchone()[0]
+        excess = self._entries - int(self.max_entries * self.evict_to)
+        if excess > 0 and self._entries > self.max_entries:
+            connection.execute(
+                "DELETE FROM scores WHERE key IN (SELECT key FROM scores ORDER BY last_used LIMIT ?)", (excess,)
+            )
+            connection.commit()
+            self._entries -= excess
+
+    def report(self) -> Dict[str, Any]:
+        """
+        Hit rates of this process, per namespace and overall
+        :return: Dict with entries, max_entries, hits, misses, hit_rate and per-namespace counts
+        """
+        with self._lock:
+            self._connect()
+            namespaces = {}
+            for namespace, counts in self.stats.items():
+                lookups = counts["hits"] + counts["misses"]
+                namespaces[namespace] = dict(counts, hit_rate=counts["hits"] / lookups if lookups else 0.0)
+            hits = sum(counts["hits"] for counts in self.stats.values())
+            lookups = hits + sum(counts["misses"] for counts in self.stats.values())
+            return {
+                "entries": self._entries,
+                "max_entries": self.max_entries,
+                "hits": hits,
+                "misses": lookups - hits,
+                "hit_rate": hits / lookups if lookups else 0.0,
+                "namespaces": namespaces,
+            }
+
+    def close(self) -> None:
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+    def __getstate__(self) -> dict:
+        # Connections and locks cannot be pickled; worker copies reopen the same database
+        return {"path": self.path, "max_entries": self.max_entries, "evict_to": self.evict_to}
+
+    def __setstate__(self, state: dict) -> None:
+        self.__init__(**state)
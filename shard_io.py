@@ -0,0 +1,264 @@
+import os
+import json
+import threading
+from typing import Dict, Iterable, List, Type
+
+from run_manifest import file_sha256
+
+DEFAULT_SHARD_SIZE = 256 * 1024 * 1024
+# Record fields written by the structured formats
+RECORD_FIELDS = ('text', 'lang', 'conf', 'source', 'offset', 'chunk')
+
+
+def _import_zstandard():
+    """zstandard, imported on first use (optional dependency of .jsonl.zst shards)"""
+    try:
+        import zstandard
+    except ImportError:
+        raise ImportError("zstandard is required for the jsonl.zst output format (pip install zstandard)") from None
+    return zstandard
+
+
+def _import_pyarrow(purpose: str):
+    """
+    pyarrow with its ipc and parquet modules, imported on first use (optional dependency of
+    Parquet/Arrow shards); importing it up front would slow down importing the cleaner
+    """
+    try:
+        import pyarrow
+        import pyarrow.ipc
+        import pyarrow.parquet
+    except ImportError:
+        raise ImportError(f"pyarrow is required {purpose} (pip install pyarrow)") from None
+    return pyarrow
+
+
+class ShardWriter:
+    """
+    Base class of the output writers used by distributed_clean
+    Records are written to <base_path>-00000<extension>, <base_path>-00001<extension>, ...,
+    starting a new shard once about shard_size bytes of text went into the current one.
+    Each shard is written to a temporary file and renamed into place when it is complete.
+    Subclasses implement _open, _write_records and _finish (and check_dependencies when they need
+    optional packages).
+    """
+    extension = '.txt'
+
+    @classmethod
+    def check_dependencies(cls) -> None:
+        """Raise ImportError if an optional package needed by this format is missing"""
+
+    def __init__(self, base_path: str, shard_size: int = DEFAULT_SHARD_SIZE):
+        """
+        :param base_path: Output path without shard number and extension
+        :param shard_size: Target uncompressed text bytes per shard
+        """
+        self.base_path = base_path
+        self.shard_size = shard_size
+        self.shards = []
+        self._path = None
+        self._tmp_path = None
+        self._opened = False
+        self._records = 0
+        self._text_bytes = 0
+
+    def write(self, records: Iterable[dict]) -> None:
+        """
+        Write records
+        :param records: Dicts with the keys in RECORD_FIELDS
+        """
+        pending = []
+        for record in records:
+            if self._path is None:
+                self._start_shard()
+            pending.append(record)
+            self._records += 1
+            self._text_bytes += len(record['text'].encode('utf-8'))
+            if self._text_bytes >= self.shard_size:
+                self._write_records(pending)
+                pending = []
+                self._end_shard()
+        if pending:
+            self._write_records(pending)
+
+    def close(self) -> List[Dict[str, object]]:
+        """
+        Finish the last shard
+        :return: Per shard: file name, records, bytes and sha256
+        """
+        if self._path is not None:
+            self._end_shard()
+        return self.shards
+
+    def abort(self) -> None:
+        """Discard the shard in progress"""
+        if self._tmp_path is not None:
+            try:
+                # _open may have failed (e.g. missing optional package): nothing to finish then
+                if self._opened:
+                    self._finish()
+            finally:
+                if os.path.exists(self._tmp_path):
+                    os.remove(self._tmp_path)
+                self._path = self._tmp_path = None
+                self._opened = False
+
+    def _start_shard(self) -> None:
+        self._path = f"{self.base_path}-{len(self.shards):05d}{self.extension}"
+        self._tmp_path = f"{self._path}.tmp-{os.getpid()}-{threading.get_ident()}"
+        self._records = 0
+        self._text_bytes = 0
+        self._open(self._tmp_path)
+        self._opened = True
+
+    def _end_shard(self) -> None:
+        self._finish()
+        os.replace(self._tmp_path, self._path)
+        self.shards.append({
+            'file': os.path.basename(self._path),
+            'records': self._records,
+            'bytes': os.path.getsize(self._path),
+            'sha256': file_sha256(self._path),
+        })
+        self._path = self._tmp_path = None
+        self._opened = False
+
+    def _open(self, path: str) -> None:
+        raise NotImplementedError
+
+    def _write_records(self, records: List[dict]) -> None:
+        raise NotImplementedError
+
+    def _finish(self) -> None:
+        raise NotImplementedError
+
+
+class TextWriter(ShardWriter):
+    """Bare text lines (the original output format; metadata is dropped)"""
+    extension = '.txt'
+
+    def _open(self, path: str) -> None:
+        self._file = open(path, 'wb')
+
+    def _write_records(self, records: List[dict]) -> None:
+        self._file.write(''.join(record['text'] + '\n' for record in records).encode('utf-8'))
+
+    def _finish(self) -> None:
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._file.close()
+
+
+class JsonlZstdWriter(TextWriter):
+    """zstd-compressed JSON lines with all record fields"""
+    extension = '.jsonl.zst'
+    level = 3
+
+    @classmethod
+    def check_dependencies(cls) -> None:
+        _import_zstandard()
+
+    def _open(self, path: str) -> None:
+        self._zstandard = _import_zstandard()
+        self._raw = open(path, 'wb')
+        self._file = self._zstandard.ZstdCompressor(level=self.level).stream_writer(self._raw)
+
+    def _write_records(self, records: List[dict]) -> None:
+        self._file.write(''.join(json.dumps(record, ensure_ascii=False) + '\n' for record in records).encode('utf-8'))
+
+    def _finish(self) -> None:
+        self._file.flush(self._zstandard.FLUSH_FRAME)
+        self._raw.flush()
+        os.fsync(self._raw.fileno())
+        self._file.close()
+
+
+def _arrow_schema(pa):
+    return pa.schema([
+        ('text', pa.string()),
+        ('lang', pa.dictionary(pa.int16(), pa.string())),
+        ('conf', pa.float32()),
+        ('source', pa.dictionary(pa.int32(), pa.string())),
+        ('offset', pa.int64()),
+        ('chunk', pa.int32()),
+    ])
+
+
+class _ArrowBatchWriter(ShardWriter):
+    """Buffers records into Arrow record batches of row_group_size rows"""
+    row_group_size = 10000
+
+    @classmethod
+    def check_dependencies(cls) -> None:
+        _import_pyarrow(f"for the {cls.extension} output format")
+
+    def _open(self, path: str) -> None:
+        self._pa = _import_pyarrow(f"for the {self.extension} output format")
+        self._schema = _arrow_schema(self._pa)
+        self._buffer = []
+        self._writer = self._create_writer(path)
+
+    def _write_records(self, records: List[dict]) -> None:
+        self._buffer.extend(records)
+        while len(self._buffer) >= self.row_group_size:
+            self._flush_buffer(self._buffer[:self.row_group_size])
+            self._buffer = self._buffer[self.row_group_size:]
+
+    def _flush_buffer(self, records: List[dict]) -> None:
+        columns = {field: [record[field] for record in records] for field in RECORD_FIELDS}
+        self._writer.write_batch(self._pa.RecordBatch.from_pydict(columns, schema=self._schema))
+
+    def _finish(self) -> None:
+        if self._buffer:
+            self._flush_buffer(self._buffer)
+            self._buffer = []
+        self._writer.close()
+
+    def _create_writer(self, path: str):
+        raise NotImplementedError
+
+
+class ParquetWriter(_ArrowBatchWriter):
+    """zstd-compressed Parquet shards (columnar: readers can load a subset of the columns)"""
+    extension = '.parquet'
+    compression = 'zstd'
+
+    def _create_writer(self, path: str):
+        return self._pa.parquet.ParquetWriter(path, self._schema, compression=self.compression)
+
+
+class ArrowWriter(_ArrowBatchWriter):
+    """
+    Arrow IPC (Feather v2) shards; uncompressed by default so that readers can memory-map them
+    and use the columns without copying or parsing
+    """
+    extension = '.arrow'
+    compression = None
+
+    def _create_writer(self, path: str):
+        options = self._pa.ipc.IpcWriteOptions(compression=self.compression)
+        return self._pa.ipc.new_file(path, self._schema, options=options)
+
+
+# Output formats of distributed_clean; register custom ShardWriter subclasses here
+WRITERS: Dict[str, Type[ShardWriter]] = {
+    'text': TextWriter,
+    'jsonl.zst': JsonlZstdWriter,
+    'parquet': ParquetWriter,
+    'arrow': ArrowWriter,
+}
+
+
+def read_shard(path: str, columns: List[str] = None):
+    """
+    Read a Parquet or Arrow shard as a pyarrow Table
+    Arrow shards are memory-mapped; Parquet shards only decode the requested columns.
+    :param path: Shard path
+    :param columns: Columns to load (all if None)
+    :return: pyarrow.Table
+    """
+    pa = _import_pyarrow("to read Parquet/Arrow shards")
+    if path.endswith('.parquet'):
+        return pa.parquet.read_table(path, columns=columns, memory_map=True)
+    table = pa.ipc.open_file(pa.memory_map(path, 'r')).read_all()
+    return table.select(columns) if columns else table
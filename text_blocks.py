@@ -0,0 +1,121 @@
+import io
+import os
+import gzip
+import json
+from typing import List, Tuple, Iterator, Optional
+
+# Optional zstandard support for .zst inputs (pip install zstandard)
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+DEFAULT_BLOCK_SIZE = 64 * 1024 * 1024
+COMPRESSED_SUFFIXES = ('.gz', '.zst', '.zstd')
+JSONL_SUFFIXES = ('.jsonl', '.ndjson')
+
+# A block is (path, start offset, end offset); end is None for "until the end of the file"
+Block = Tuple[str, int, Optional[int]]
+
+
+def is_compressed(path: str) -> bool:
+    return path.endswith(COMPRESSED_SUFFIXES)
+
+
+def is_jsonl(path: str) -> bool:
+    """JSONL detection that looks through a compression suffix (e.g. data.jsonl.gz)"""
+    for suffix in COMPRESSED_SUFFIXES:
+        if path.endswith(suffix):
+            path = path[:-len(suffix)]
+            break
+    return path.endswith(JSONL_SUFFIXES)
+
+
+def plan_blocks(file_paths: List[str], block_size: int = DEFAULT_BLOCK_SIZE) -> List[Block]:
+    """
+    Split input files into byte-range blocks
+    Plain files are cut every block_size bytes (readers realign to line boundaries); compressed
+    files cannot be entered mid-stream, so each one is a single block.
+    :param file_paths: Input files
+    :param block_size: Target bytes per block
+    :return: List of (path, start, end) blocks
+    """
+    blocks = []
+    for path in file_paths:
+        if is_compressed(path):
+            blocks.append((path, 0, None))
+            continue
+        size = os.path.getsize(path)
+        for start in range(0, max(size, 1), block_size):
+            blocks.append((path, start, min(start + block_size, size)))
+    return blocks
+
+
+def open_binary(path: str) -> io.BufferedIOBase:
+    """Open a file for binary reading, decompressing .gz and .zst on the fly"""
+    if path.endswith('.gz'):
+        return gzip.open(path, 'rb')
+    if path.endswith(('.zst', '.zstd')):
+        if zstandard is None:
+            raise ImportError(f"zstandard is required to read {path} (pip install zstandard)")
+        raw = open(path, 'rb')
+        return io.BufferedReader(zstandard.ZstdDecompressor().stream_reader(raw, closefd=True))
+    return open(path, 'rb')
+
+
+def iter_block_lines(block: Block) -> Iterator[Tuple[int, str]]:
+    """
+    Stream the lines of a block
+    A line belongs to the block in which it starts: a block starting mid-line skips to the next
+    line, and the last line is read past the block end until its newline.
+    :param block: (path, start, end)
+    :return: Iterator of (byte offset of the line in the (decompressed) file, decoded line
+             without line terminators)
+    """
+    path, start, end = block
+    with open_binary(path) as f:
+        if start > 0:
+            # Step back one byte so a line starting exactly at `start` is kept
+            f.seek(start - 1)
+            f.readline()
+        position = f.tell() if start > 0 else 0
+        for line in f:
+            if end is not None and position >= end:
+                break
+            offset = position
+            position += len(line)
+            yield offset, line.decode('utf-8', errors='ignore').rstrip('\r\n')
+
+
+def iter_block_records(block: Block, field: str = 'text') -> Iterator[Tuple[int, str]]:
+    """
+    Stream non-empty texts of a block with their line offsets, extracting a field from JSONL records
+    :param block: (path, start, end)
+    :param field: Name of the text field in JSONL records
+    :return: Iterator of (offset, text) (malformed JSONL records are skipped)
+    """
+    parse_json = is_jsonl(block[0])
+    for offset, line in iter_block_lines(block):
+        if not line.strip():
+            continue
+        if not parse_json:
+            yield offset, line
+            continue
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError:
+            continue
+        text = record.get(field) if isinstance(record, dict) else None
+        if isinstance(text, str):
+            yield offset, text
+
+
+def iter_block_texts(block: Block, field: str = 'text') -> Iterator[str]:
+    """
+    Stream non-empty texts of a block, extracting a field from JSONL records
+    :param block: (path, start, end)
+    :param field: Name of the text field in JSONL records
+    :return: Iterator of texts (malformed JSONL records are skipped)
+    """
+    for _, text in iter_block_records(block, field):
+        yield text
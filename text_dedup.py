@@ -0,0 +1,298 @@
+import os
+import json
+import numpy as np
+from typing import List, Dict, Tuple, Optional
+
+# Hash arithmetic is done modulo a Mersenne prime below 2^31 so that
+# products of two residues always fit into uint64 without overflow
+MERSENNE_PRIME = np.uint64((1 << 31) - 1)
+SHINGLE_BASE = np.uint64(1000003)
+# Shingles are hashed against all permutations in blocks to bound temporary memory
+SHINGLE_BLOCK_SIZE = 4096
+# Odd multiplier of the polynomial hash folding the rows of an LSH band into one 64-bit key
+BAND_HASH_MULTIPLIER = 0x9E3779B97F4A7C15
+
+
+def shingle_hashes(text: str, shingle_size: int = 5) -> np.ndarray:
+    """
+    Hash the character shingles of a text
+    :param text: Input text (lowercased and whitespace-normalized before shingling)
+    :param shingle_size: Number of characters per shingle
+    :return: Array of unique shingle hashes (uint64, each below MERSENNE_PRIME)
+    """
+    normalized = ' '.join(text.lower().split())
+    codes = np.frombuffer(normalized.encode('utf-32-le'), dtype=np.uint32).astype(np.uint64)
+    if len(codes) == 0:
+        return codes
+    # Texts shorter than one shingle are treated as a single shingle
+    window = min(shingle_size, len(codes))
+    count = len(codes) - window + 1
+
+    # Polynomial rolling hash over every window, computed column by column
+    hashes = np.zeros(count, dtype=np.uint64)
+    for offset in range(window):
+        hashes = (hashes * SHINGLE_BASE + codes[offset:offset + count]) % MERSENNE_PRIME
+    return np.unique(hashes)
+
+
+def optimal_lsh_params(threshold: float, num_perm: int) -> Tuple[int, int]:
+    """
+    Choose the number of bands and rows per band for a Jaccard threshold
+    Minimizes the sum of the false positive and false negative probability mass.
+    :param threshold: Jaccard similarity threshold
+    :param num_perm: Number of MinHash permutations
+    :return: Tuple of (bands, rows)
+    """
+    below = np.linspace(0.0, threshold, 200)
+    above = np.linspace(threshold, 1.0, 200)
+    best, best_error = (1, num_perm), float('inf')
+    for bands in range(1, num_perm + 1):
+        rows = num_perm // bands
+        # Probability that two documents with similarity s share at least one bucket
+        false_positive = np.mean(1 - (1 - below ** rows) ** bands) * threshold
+        false_negative = np.mean((1 - above ** rows) ** bands) * (1 - threshold)
+        error = false_positive + false_negative
+        if error < best_error:
+            best, best_error = (bands, rows), error
+    return best
+
+
+class MinHashLSH:
+    """
+    Near-duplicate detector based on shingling, MinHash signatures and LSH banding
+    Each indexed document costs a fixed-size signature (num_perm uint32 values) plus one
+    bucket entry per band, and a lookup only compares against documents sharing a bucket.
+    Buckets are keyed by 64-bit integers and hold every document id of the key (a bare int while
+    the bucket has a single document, which is the common case, and a list after that).
+    """
+    def __init__(self, threshold: float = 0.8, num_perm: int = 128, shingle_size: int = 5, seed: int = 1,
+                 max_bucket_size: int = 64):
+        """
+        :param threshold: Estimated Jaccard similarity at or above which documents are duplicates
+        :param num_perm: Number of hash permutations (signature length)
+        :param shingle_size: Number of characters per shingle
+        :param seed: Seed for the permutation coefficients
+        :param max_bucket_size: Maximum number of document ids kept per bucket (None for no limit);
+                                bounds memory and lookup cost on huge template families, at the price
+                                of not finding a document through a band whose bucket was full
+        """
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        self.max_bucket_size = max_bucket_size
+        rng = np.random.RandomState(seed)
+        self.coef_a = rng.randint(1, int(MERSENNE_PRIME), size=num_perm).astype(np.uint64)
+        self.coef_b = rng.randint(0, int(MERSENNE_PRIME), size=num_perm).astype(np.uint64)
+        self.bands, self.rows = optimal_lsh_params(threshold, num_perm)
+        self.buckets = [{} for _ in range(self.bands)]
+        # Powers of BAND_HASH_MULTIPLIER modulo 2^64 (uint64 arithmetic wraps around)
+        self.band_powers = np.array([pow(BAND_HASH_MULTIPLIER, self.rows - 1 - row, 1 << 64)
+                                     for row in range(self.rows)], dtype=np.uint64)
+        # Signatures of indexed documents, grown by doubling
+        self.signatures = np.empty((1024, num_perm), dtype=np.uint32)
+        self.count = 0
+
+    def signature(self, text: str) -> np.ndarray:
+        """
+        Compute the MinHash signature of a text
+        :param text: Input text
+        :return: Signature array of length num_perm
+        """
+        hashes = shingle_hashes(text, self.shingle_size)
+        signature = np.full(self.num_perm, MERSENNE_PRIME, dtype=np.uint64)
+        for start in range(0, len(hashes), SHINGLE_BLOCK_SIZE):
+            block = hashes[start:start + SHINGLE_BLOCK_SIZE]
+            permuted = (np.outer(self.coef_a, block) + self.coef_b[:, None]) % MERSENNE_PRIME
+            np.minimum(signature, permuted.min(axis=1), out=signature)
+        return signature.astype(np.uint32)
+
+    def _band_keys(self, signature: np.ndarray) -> List[int]:
+        """
+        Fold every band of a signature into one 64-bit integer bucket key
+        Integer keys take far less memory than bytes keys; a rare key collision only adds a
+        candidate, which query verifies against the full signature.
+        """
+        bands = signature[:self.bands * self.rows].reshape(self.bands, self.rows).astype(np.uint64)
+        return (bands * self.band_powers).sum(axis=1, dtype=np.uint64).tolist()
+
+    def query(self, signature: np.ndarray) -> Optional[int]:
+        """
+        Find an indexed document similar to the given signature
+        :param signature: MinHash signature
+        :return: Id of the first matching document, or None
+        """
+        checked = set()
+        for band_buckets, key in zip(self.buckets, self._band_keys(signature)):
+            bucket = band_buckets.get(key)
+            if bucket is None:
+                continue
+            candidates = [bucket] if type(bucket) is int else bucket
+            for doc_id in candidates:
+                if doc_id in checked:
+                    continue
+                checked.add(doc_id)
+                # Verify the candidate with the estimated Jaccard similarity
+                similarity = np.count_nonzero(self.signatures[doc_id] == signature) / self.num_perm
+                if similarity >= self.threshold:
+                    return doc_id
+        return None
+
+    def insert(self, signature: np.ndarray) -> int:
+        """
+        Index a signature
+        :param signature: MinHash signature
+        :return: Id assigned to the document
+        """
+        if self.count == len(self.signatures):
+            self.signatures = np.resize(self.signatures, (2 * len(self.signatures), self.num_perm))
+        doc_id = self.count
+        self.signatures[doc_id] = signature
+        self.count += 1
+        for band_buckets, key in zip(self.buckets, self._band_keys(signature)):
+            bucket = band_buckets.get(key)
+            if bucket is None:
+                band_buckets[key] = doc_id
+            elif type(bucket) is int:
+                if self.max_bucket_size is None or self.max_bucket_size > 1:
+                    band_buckets[key] = [bucket, doc_id]
+            elif self.max_bucket_size is None or len(bucket) < self.max_bucket_size:
+                bucket.append(doc_id)
+        return doc_id
+
+    def check_and_insert(self, text: str) -> Optional[int]:
+        """
+        Check a text against the index and insert it if no near duplicate exists
+        :param text: Input text
+        :return: Id of the matching indexed document if the text is a near duplicate, else None
+        """
+        signature = self.signature(text)
+        match = self.query(signature)
+        if match is None:
+            self.insert(signature)
+        return match
+
+    def deduplicate(self, texts: List[str]) -> Tuple[List[int], Dict[int, List[int]]]:
+        """
+        Remove near duplicates from a list of texts, keeping the first occurrence
+        :param texts: List of texts
+        :return: Tuple of (indices of kept texts, clusters mapping a kept index to its duplicate indices)
+        """
+        kept = []
+        clusters = {}
+        first_id = self.count
+
+        for index, text in enumerate(texts):
+            match = self.check_and_insert(text)
+            if match is None:
+                kept.append(index)
+            elif match >= first_id:
+                # Document ids are assigned in insertion order, so they map straight onto kept
+                clusters.setdefault(kept[match - first_id], []).append(index)
+        return kept, clusters
+
+
+class FingerprintIndex:
+    """
+    Persistent on-disk set of 64-bit text fingerprints for cross-run deduplication
+    Fingerprints live in an open-addressing hash table (linear probing) inside a memory-mapped
+    file, so lookups are O(1) and the stored fingerprints never become Python objects.
+    The table doubles in size once the load factor exceeds max_load.
+    """
+    def __init__(self, path: str, initial_capacity: int = 1 << 20, max_load: float = 0.7):
+        """
+        :param path: Path of the table file (capacity and count are also written to <path>.meta for inspection)
+        :param initial_capacity: Number of slots for a new index (rounded up to a power of two)
+        :param max_load: Load factor that triggers growing the table
+        """
+        self.path = path
+        self.meta_path = path + '.meta'
+        self.max_load = max_load
+
+        if os.path.exists(self.path):
+            # The table file itself is authoritative: the metadata may be stale after a crash
+            # (e.g. between replacing the table in _grow and writing the new capacity)
+            self.capacity = os.path.getsize(self.path) // 8
+            self.table = np.memmap(self.path, dtype=np.uint64, mode='r+', shape=(self.capacity,))
+            self.count = int(np.count_nonzero(self.table))
+            if self.count > self.capacity * self.max_load:
+                self._grow()
+        else:
+            self.capacity = 1 << max(int(initial_capacity) - 1, 1).bit_length()
+            self.count = 0
+            # A fresh memmap is zero-filled; 0 marks an empty slot
+            self.table = np.memmap(self.path, dtype=np.uint64, mode='w+', shape=(self.capacity,))
+            self.flush()
+
+    @staticmethod
+    def fingerprint(digest: bytes) -> int:
+        """
+        Derive a 64-bit fingerprint from a hash digest
+        :param digest: Digest of at least 8 bytes (e.g. MD5 of the normalized text)
+        :return: Non-zero 64-bit fingerprint
+        """
+        return int.from_bytes(digest[:8], 'little') or 1
+
+    def _find_slot(self, fingerprint: int) -> Tuple[int, bool]:
+        """Probe for a fingerprint, returning (slot, found)"""
+        mask = self.capacity - 1
+        slot = fingerprint & mask
+        while True:
+            value = int(self.table[slot])
+            if value == fingerprint:
+                return slot, True
+            if value == 0:
+                return slot, False
+            slot = (slot + 1) & mask
+
+    def __contains__(self, fingerprint: int) -> bool:
+        return self._find_slot(fingerprint)[1]
+
+    def __len__(self) -> int:
+        return self.count
+
+    def add(self, fingerprint: int) -> bool:
+        """
+        Insert a fingerprint
+        :param fingerprint: 64-bit fingerprint
+        :return: True if it was new, False if it was already in the index
+        """
+        slot, found = self._find_slot(fingerprint)
+        if found:
+            return False
+        self.table[slot] = fingerprint
+        self.count += 1
+        if self.count > self.capacity * self.max_load:
+            self._grow()
+        return True
+
+    def _grow(self) -> None:
+        """Rehash all fingerprints into a table twice as large"""
+        old_values = np.array(self.table[self.table != 0])
+        tmp_path = self.path + '.tmp'
+        self.capacity *= 2
+        new_table = np.memmap(tmp_path, dtype=np.uint64, mode='w+', shape=(self.capacity,))
+        mask = self.capacity - 1
+        for value in old_values.tolist():
+            slot = value & mask
+            while new_table[slot] != 0:
+                slot = (slot + 1) & mask
+            new_table[slot] = value
+        new_table.flush()
+        del self.table, new_table
+
+        os.replace(tmp_path, self.path)
+        self.table = np.memmap(self.path, dtype=np.uint64, mode='r+', shape=(self.capacity,))
+        self.flush()
+
+    def close(self) -> None:
+        """Flush and release the memory map"""
+        self.flush()
+        self.table = None
+
+    def flush(self) -> None:
+        """Write pending changes and metadata to disk"""
+        self.table.flush()
+        tmp_path = self.meta_path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'capacity': self.capacity, 'count': self.count}, f)
+        os.replace(tmp_path, self.meta_path)
@@ -0,0 +1,145 @@
+from typing import Callable, Dict, List, Tuple, Union
+from pipeline_metrics import StageMetrics, NULL_METRICS
+
+# Stage kinds:
+#   'filter' - per-item predicate, the item is dropped when it returns False
+#   'map'    - per-item transform, the item is dropped when it returns None
+#   'batch'  - whole-list stage (e.g. deduplication) that needs to see every item
+STAGE_KINDS = ('filter', 'map', 'batch')
+
+
+class PipelineStage:
+    """A configured pipeline stage"""
+    def __init__(self, name: str, kind: str, func: Callable):
+        if kind not in STAGE_KINDS:
+            raise ValueError(f"Unknown stage kind '{kind}', expected one of {STAGE_KINDS}")
+        self.name = name
+        self.kind = kind
+        self.func = func
+
+    def __repr__(self) -> str:
+        return f"PipelineStage({self.name!r}, {self.kind!r})"
+
+
+class StageRegistry:
+    """
+    Registry of named stage factories
+    A factory receives the stage parameters from the config and returns the stage function.
+    """
+    def __init__(self):
+        self.factories = {}
+
+    def register(self, name: str, kind: str, factory: Callable[..., Callable]) -> None:
+        """
+        Register a stage factory
+        :param name: Stage name used in pipeline configs
+        :param kind: 'filter', 'map' or 'batch'
+        :param factory: Callable taking the stage parameters and returning the stage function
+        """
+        if kind not in STAGE_KINDS:
+            raise ValueError(f"Unknown stage kind '{kind}', expected one of {STAGE_KINDS}")
+        self.factories[name] = (kind, factory)
+
+    def create(self, name: str, **params) -> PipelineStage:
+        """
+        Instantiate a registered stage
+        :param name: Stage name
+        :param params: Stage parameters
+        :return: Configured stage
+        """
+        if name not in self.factories:
+            raise KeyError(f"Unknown pipeline stage '{name}', registered: {sorted(self.factories)}")
+        kind, factory = self.factories[name]
+        return PipelineStage(name, kind, factory(**params))
+
+    def build(self, config: List[Union[str, dict]]) -> 'Pipeline':
+        """
+        Build a pipeline from a config
+        :param config: Ordered list of stage names or dicts like {'stage': 'length_filter', 'min_length': 10}
+        :return: Pipeline with adjacent per-item stages fused
+        """
+        stages = []
+        for entry in config:
+            if isinstance(entry, str):
+                stages.append(self.create(entry))
+            else:
+                params = dict(entry)
+                stages.append(self.create(params.pop('stage'), **params))
+        return Pipeline(stages)
+
+
+class Pipeline:
+    """
+    Ordered list of stages executed with stage fusion
+    Adjacent 'filter'/'map' stages are fused into a single pass that carries each document
+    through all of them and stops at the first rejection, so later (expensive) stages only
+    see survivors. 'batch' stages run on the whole list between fused groups.
+    """
+    def __init__(self, stages: List[PipelineStage]):
+        self.stages = stages
+        self.groups = self._fuse(stages)
+
+    @staticmethod
+    def _fuse(stages: List[PipelineStage]) -> List[Tuple[str, List[PipelineStage]]]:
+        """Group stages into ('batch', [stage]) and ('items', [stage, ...]) runs"""
+        groups = []
+        for stage in stages:
+            if stage.kind == 'batch':
+                groups.append(('batch', [stage]))
+            elif groups and groups[-1][0] == 'items':
+                groups[-1][1].append(stage)
+            else:
+                groups.append(('items', [stage]))
+        return groups
+
+    def run(self, texts: List[str], metrics: StageMetrics = None) -> Tuple[List[str], dict]:
+        """
+        Run the pipeline
+        :param texts: Original list of texts
+        :param metrics: Optional StageMetrics (fused groups are measured as one stage)
+        :return: Tuple of (output texts, statistics with removals per stage)
+        """
+        metrics = metrics or NULL_METRICS
+        original_count = len(texts)
+        removed = {stage.name: 0 for stage in self.stages}
+
+        for group_kind, group in self.groups:
+            group_name = '+'.join(stage.name for stage in group)
+            with metrics.stage(group_name, texts) as record:
+                if group_kind == 'batch':
+                    stage = group[0]
+                    output = stage.func(texts)
+                    removed[stage.name] += len(texts) - len(output)
+                    texts = output
+                else:
+                    texts = self._run_fused(group, texts, removed)
+                record.set_output(texts)
+
+        stats = {
+            'original_count': original_count,
+            'final_count': len(texts),
+            'removed_by_stage': removed,
+        }
+        if metrics.enabled:
+            stats['stages'] = metrics.report()
+        return texts, stats
+
+    @staticmethod
+    def _run_fused(stages: List[PipelineStage], texts: List[str], removed: Dict[str, int]) -> List[str]:
+        """Carry every text through a run of per-item stages in a single pass"""
+        steps = [(stage.name, stage.kind == 'filter', stage.func) for stage in stages]
+        output = []
+        for text in texts:
+            for name, is_filter, func in steps:
+                if is_filter:
+                    if not func(text):
+                        removed[name] += 1
+                        break
+                else:
+                    text = func(text)
+                    if text is None:
+                        removed[name] += 1
+                        break
+            else:
+                output.append(text)
+        return output